@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+RTA Pipeline Benchmarks
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import gc
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+import numpy as np
+import scipy
+import Data_Reader
+import Pseudopressure_Conversion
+import Slope_Interval_Search
+import Smoothing_Experiment
+
+# Peak resident memory comes from getrusage, which only Unix provides
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Input sizes of the microbenchmarks, samples
+sizes = tuple(10 ** k for k in range(3, 8))
+
+# One parameter set per method of the paper for the end-to-end replay
+replay_grid = {
+    "Gaussian Kernel": [{"sigma": 5}],
+    "GAM": [{}],
+    "B-Spline": [{"n_splines": 100}],
+    "Lowess": [{"span": 5}],
+    "Savitzky-Golay": [{"window": 5, "order": 2}]
+}
+
+# ----- Synthetic Inputs -----
+def synthetic_inputs(n, folder, seed = 0):
+
+    # Step 1: A PVT table and a production history of n samples, shaped like the synthetic model
+    rng = np.random.default_rng(seed)
+    pvt_pressure = np.linspace(14.7, 6000, 500) # psia
+    pvt_Z = 0.9 + 2e-5 * (pvt_pressure - 3000) ** 2 / 3000
+    pvt_mug = 0.012 + 2.5e-6 * pvt_pressure # cp
+    pvt_cg = 1 / pvt_pressure # 1/psi
+    time = np.logspace(-0.6, np.log10(73000), n) # days
+    res_pressure = np.linspace(5000, 1500, n) # psia
+    # Linear flow bending into boundary-dominated flow, so that only part of the history has slope 0.5
+    log_RNP = 0.5 * np.log(time) + np.log1p(time / 40000) + 15 + rng.normal(0, 0.05, n)
+    dense_pressure = np.linspace(14.7, 6000, n) # psia
+
+    # Step 2: A two-column text file of the history for the readers
+    file_path = os.path.join(folder, f"history_{n}.txt")
+    with open(file_path, "w") as file:
+        file.write("t(days)\tRNP(psia2/cp-d/Mscf)\n")
+        for start in range(0, n, 65536):
+            file.write("".join(f"{a!r}\t{b!r}\n" for a, b in zip(time[start:start + 65536].tolist(), np.exp(log_RNP[start:start + 65536]).tolist())))
+
+    return {
+        "pvt_pressure": pvt_pressure, "pvt_Z": pvt_Z, "pvt_mug": pvt_mug, "pvt_cg": pvt_cg,
+        "pvt_ct": pvt_cg + 3e-6, "time": time, "res_pressure": res_pressure, "log_time": np.log(time),
+        "log_RNP": log_RNP, "file_path": file_path, "dense_pressure": dense_pressure,
+        "dense_mug": np.interp(dense_pressure, pvt_pressure, pvt_mug), "dense_Z": np.interp(dense_pressure, pvt_pressure, pvt_Z),
+        "table": Pseudopressure_Conversion.PVTTable(pvt_pressure, pvt_Z, pvt_mug, pvt_cg)
+    }
+
+# ----- Microbenchmarks -----
+def _smoother(method, parameters):
+
+    return lambda inputs: lambda: Smoothing_Experiment.methods[method](inputs["log_time"], inputs["log_RNP"][None, :], **parameters)
+
+# Name: (callable of the inputs returning the timed call, largest size it is run at)
+microbenchmarks = {
+    "parse_columns": (lambda inputs: lambda: Data_Reader.read_columns(inputs["file_path"], cache = False), 10 ** 7),
+    "read_columns_cached": (lambda inputs: lambda: [np.asarray(column).sum() for column in Data_Reader.read_columns(inputs["file_path"], mmap = True)], 10 ** 7),
+    "iter_columns": (lambda inputs: lambda: sum(len(block[0]) for block in Data_Reader.iter_columns(inputs["file_path"])), 10 ** 7),
+    "interpolate_data": (lambda inputs: lambda: Pseudopressure_Conversion.interpolate_data(inputs["pvt_pressure"], inputs["pvt_mug"], inputs["res_pressure"]), 10 ** 7),
+    # A PVT table of n rows
+    "calculate_pseudopressure": (lambda inputs: lambda: Pseudopressure_Conversion.calculate_pseudopressure(
+        inputs["dense_pressure"], inputs["dense_mug"], inputs["dense_Z"]), 10 ** 7),
+    "calculate_pseudotime": (lambda inputs: lambda: Pseudopressure_Conversion.calculate_pseudotime(
+        inputs["time"], inputs["res_pressure"], inputs["pvt_pressure"], inputs["pvt_mug"], inputs["pvt_ct"]), 10 ** 7),
+    "pvt_table_lookup": (lambda inputs: lambda: inputs["table"].lookup(inputs["res_pressure"]), 10 ** 7),
+    "gaussian_kernel": (_smoother("Gaussian Kernel", {"sigma": 5}), 10 ** 7),
+    "moving_average": (_smoother("Moving Average", {"window": 5}), 10 ** 7),
+    "lowess": (_smoother("Lowess", {"span": 5}), 10 ** 7),
+    "savitzky_golay": (_smoother("Savitzky-Golay", {"window": 5, "order": 2}), 10 ** 7),
+    # The P-spline basis is dense, 8 bytes x samples x splines
+    "gam": (_smoother("GAM", {}), 10 ** 6),
+    "b_spline": (_smoother("B-Spline", {"n_splines": 100}), 10 ** 5),
+    # Windows up to 128 samples; the full search over every window length keeps a quadratic number of intervals
+    "slope_search": (lambda inputs: lambda: Slope_Interval_Search.search_slope_intervals(
+        inputs["time"], np.exp(inputs["log_RNP"]), max_length = 128, max_intervals = 1), 10 ** 7),
+    "slope_search_full": (lambda inputs: lambda: Slope_Interval_Search.search_slope_intervals(
+        inputs["time"], np.exp(inputs["log_RNP"]), max_intervals = 1), 10 ** 3)
+}
+
+def time_call(function, repeats = 3):
+
+    # The first call pays for caches (operators, factorizations, sidecars), the best of the rest is the steady state
+    gc.collect()
+    times = []
+    for _ in range(repeats + 1):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    # One more, traced call for the steady-state peak memory allocated by this benchmark alone, kept out of the timings
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"first(s)": times[0], "best(s)": min(times[1:]), "mean(s)": float(np.mean(times[1:])), "peak_memory(MB)": peak / 2 ** 20}
+
+def run_microbenchmarks(benchmark_sizes = sizes, names = None, repeats = 3, time_budget = 60):
+
+    # Step 1: Run every benchmark over increasing sizes, stopping a benchmark once one call exceeds the time budget
+    names = list(microbenchmarks) if names is None else names
+    results = {name: {} for name in names}
+    stopped = set()
+    with tempfile.TemporaryDirectory() as folder:
+        for n in benchmark_sizes:
+            inputs = synthetic_inputs(n, folder)
+            for name in names:
+                build, max_size = microbenchmarks[name]
+                if n > max_size or name in stopped:
+                    results[name][str(n)] = {"skipped": "size limit" if n > max_size else "time budget"}
+                    continue
+
+                # Step 2: Time the call and report its throughput
+                timing = time_call(build(inputs), repeats)
+                timing["samples/s"] = n / timing["best(s)"]
+                results[name][str(n)] = timing
+                if timing["first(s)"] * (repeats + 1) > time_budget:
+                    stopped.add(name)
+                print(f"{name}\t{n}\t{timing['best(s)']:.6f} s\t{timing['samples/s']:.3e} samples/s\t{timing['peak_memory(MB)']:.1f} MB")
+            del inputs
+
+    return results
+
+# ----- Peak Memory -----
+def peak_rss():
+
+    # Highest resident memory since the process started, and of its largest finished worker, so it is
+    # cumulative: only the first run of a process measures that run alone; None where getrusage is missing
+    if resource is None:
+        return {"cumulative_peak_rss(MB)": None, "cumulative_peak_rss_workers(MB)": None}
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if platform.system() == "Darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 2 ** 20
+
+    return {"cumulative_peak_rss(MB)": own, "cumulative_peak_rss_workers(MB)": children}
+
+# ----- End-to-End Replay -----
+def replay_paper_grid(grid = None, store_folder = "Noisy RNP Store", max_workers = None):
+
+    # Step 1: Smooth and score every data set of the paper grid into a scratch folder, with nothing resumed
+    grid = replay_grid if grid is None else grid
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        results = Smoothing_Experiment.run_experiment(grid, scenarios = None, store_folder = store_folder,
+                                                      output_folder = output_folder, max_workers = max_workers, resume = False)
+        elapsed = time.perf_counter() - start
+
+    # Step 2: Throughput and peak memory of the run
+    return {"data_sets": len(results), "elapsed(s)": elapsed, "data_sets/s": len(results) / elapsed, **peak_rss()}
+
+# ----- Compare Results -----
+def compare_results(previous, current, tolerance = 0.2):
+
+    # Step 1: Microbenchmarks whose best time grew by more than the tolerance
+    regressions = []
+    for name, runs in current.get("microbenchmarks", {}).items():
+        for n, timing in runs.items():
+            before = previous.get("microbenchmarks", {}).get(name, {}).get(n, {})
+            if "best(s)" in timing and "best(s)" in before and timing["best(s)"] > (1 + tolerance) * before["best(s)"]:
+                regressions.append((name, n, before["best(s)"], timing["best(s)"]))
+
+    # Step 2: The end-to-end throughput, compared the other way round
+    before = previous.get("replay", {}).get("data_sets/s")
+    after = current.get("replay", {}).get("data_sets/s")
+    if before and after and after < before / (1 + tolerance):
+        regressions.append(("replay", "data_sets/s", before, after))
+
+    return regressions
+
+def write_json(file_path, results):
+
+    # Write to a temporary file and swap it in, so a crash never leaves a truncated baseline
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding = "utf-8") as file:
+        json.dump(results, file, indent = 2)
+    os.replace(temporary_path, file_path)
+
+# ----- Run Benchmarks -----
+def run_benchmarks(output_folder = "Benchmarks", benchmark_sizes = sizes, replay = True, store_folder = "Noisy RNP Store",
+                   max_workers = None, tolerance = 0.2):
+
+    # Step 1: The replay runs first, before the large microbenchmarks raise the peak memory of this process
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(), "python": platform.python_version(),
+        "numpy": np.__version__, "scipy": scipy.__version__, "cpus": os.cpu_count()
+    }
+    if replay:
+        results["replay"] = replay_paper_grid(store_folder = store_folder, max_workers = max_workers)
+    results["microbenchmarks"] = run_microbenchmarks(benchmark_sizes)
+
+    # Step 2: Compare with the previous run, keep it as the previous baseline and save the new one
+    os.makedirs(output_folder, exist_ok = True)
+    file_path = os.path.join(output_folder, "benchmark_results.json")
+    regressions = []
+    if os.path.exists(file_path):
+        with open(file_path, "r", encoding = "utf-8") as file:
+            previous = json.load(file)
+        regressions = compare_results(previous, results, tolerance)
+        write_json(os.path.join(output_folder, "benchmark_results_previous.json"), previous)
+    write_json(file_path, results)
+
+    return results, regressions
+
+# ----- Main Execution -----
+def main():
+
+    results, regressions = run_benchmarks()
+    if "replay" in results:
+        replay = results["replay"]
+        print(f"----- Paper Grid Replay: {replay['data_sets']} data sets, {replay['data_sets/s']:.1f} data sets/s -----")
+        if replay["cumulative_peak_rss(MB)"] is not None:
+            print(f"----- Peak RSS {replay['cumulative_peak_rss(MB)']:.0f} MB (workers {replay['cumulative_peak_rss_workers(MB)']:.0f} MB) -----")
+    for name, n, before, after in regressions:
+        print(f"Regression: {name} at {n}: {before:.6g} -> {after:.6g}")
+    print("--- Benchmarks Complete ---")
+
+if __name__ == "__main__":
+    main()
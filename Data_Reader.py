@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar Data Reader
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import itertools
+import numpy as np
+
+# ----- Sidecar Path -----
+def sidecar_path(file_path, skip_header, min_columns = 2):
+
+    # The parsed columns of a text file are cached next to it, per header-skip count and column minimum
+    return f"{file_path}.{skip_header}.{min_columns}.npy"
+
+def source_stamp(file_path):
+
+    # Size and nanosecond modification time of the text file the sidecar was parsed from
+    status = os.stat(file_path)
+
+    return f"{status.st_size} {status.st_mtime_ns}"
+
+# ----- Parse Text Columns -----
+def parse_columns(file_path, skip_header = 1, min_columns = 2):
+
+    # Step 1: Parse the whole file at once with the C tokenizer
+    try:
+        data = np.loadtxt(file_path, dtype = np.float64, skiprows = skip_header, ndmin = 2, encoding = "utf-8")
+
+    # Step 2: Fall back to keeping only the lines with enough values when rows are ragged
+    except ValueError:
+        with open(file_path, "r", encoding = "utf-8") as file:
+            rows = [line.split() for line in file.read().splitlines()[skip_header:]]
+        rows = [values for values in rows if len(values) >= min_columns]
+        number_columns = min((len(values) for values in rows), default = min_columns)
+        data = np.loadtxt([" ".join(values[:number_columns]) for values in rows], dtype = np.float64, ndmin = 2)
+
+    if data.size and data.shape[1] < min_columns:
+        raise ValueError(f"Expected at least {min_columns} columns in {file_path}!")
+    if not data.size:
+        data = np.empty((0, min_columns))
+
+    # Step 3: Store column-major so that every column is a contiguous array
+    return np.ascontiguousarray(data.T)
+
+# ----- Read Text Columns -----
+def read_columns(file_path, skip_header = 1, min_columns = 2, cache = True, mmap = True):
+
+    # Step 1: Load the sidecar when it was parsed from the text file as it is now
+    sidecar = sidecar_path(file_path, skip_header, min_columns)
+    stamp_path = f"{sidecar}.stamp"
+    stamp = source_stamp(file_path)
+    fresh = False
+    if cache and os.path.exists(sidecar) and os.path.exists(stamp_path):
+        with open(stamp_path, "r", encoding = "utf-8") as file:
+            fresh = file.read() == stamp
+    if fresh:
+        columns = np.load(sidecar, mmap_mode = "r" if mmap else None)
+
+    # Step 2: Otherwise parse the text and write the sidecar atomically, its stamp last
+    else:
+        columns = parse_columns(file_path, skip_header, min_columns)
+        if cache and columns.size:
+            temporary_path = f"{sidecar}.{os.getpid()}.tmp"
+            temporary_stamp_path = f"{stamp_path}.{os.getpid()}.tmp"
+            try:
+                with open(temporary_path, "wb") as file:
+                    np.save(file, columns)
+                with open(temporary_stamp_path, "w", encoding = "utf-8") as file:
+                    file.write(stamp)
+                os.replace(temporary_path, sidecar)
+                os.replace(temporary_stamp_path, stamp_path)
+            except OSError:
+                for path in (temporary_path, temporary_stamp_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+        if mmap:
+            # Read-only like the memory-mapped sidecar of later calls
+            columns.flags.writeable = False
+
+    # Step 3: Return the columns as views of the block, by default read-only and memory-mapped from the sidecar
+    # without a copy; callers that modify them in place pass mmap = False for writable in-memory arrays
+    return tuple(columns)
+
+# ----- Iterate Text Columns -----
+def iter_columns(file_path, skip_header = 1, min_columns = 2, chunk_rows = 65536):
+
+    # Parse a file of any length in fixed-size blocks of rows, keeping memory bounded
+    with open(file_path, "r", encoding = "utf-8") as file:
+        for _ in range(skip_header):
+            file.readline()
+        while True:
+            block = list(itertools.islice(file, chunk_rows))
+            if not block:
+                return
+
+            # Keep the lines with enough values, cut to the narrowest of them as in parse_columns
+            rows = [values for values in (line.split() for line in block) if len(values) >= min_columns]
+            if not rows:
+                continue
+            number_columns = min(len(values) for values in rows)
+            data = np.loadtxt([" ".join(values[:number_columns]) for values in rows], dtype = np.float64, ndmin = 2)
+            yield tuple(np.ascontiguousarray(data.T))
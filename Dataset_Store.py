@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Noisy RNP Dataset Store
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import re
+import json
+import numpy as np
+import Data_Reader
+
+# ----- Discover Noisy RNP Files -----
+def discover_noisy_model(source_folder = "Noisy RNP Model"):
+
+    # Step 1: Scenarios are the sub-folders, noise levels the "<level>%" folders below them
+    scenarios = sorted(name for name in os.listdir(source_folder) if os.path.isdir(os.path.join(source_folder, name)))
+    levels = sorted({int(name.rstrip("%")) for scenario in scenarios
+                     for name in os.listdir(os.path.join(source_folder, scenario)) if re.fullmatch(r"\d+%", name)})
+
+    # Step 2: Realizations are numbered noisy_data_<k>.txt files
+    pattern = re.compile(r"noisy_data_(\d+)\.txt")
+    realizations = set()
+    for scenario in scenarios:
+        for level in levels:
+            level_folder = os.path.join(source_folder, scenario, f"{level}%")
+            if not os.path.isdir(level_folder):
+                continue
+            for name in os.listdir(level_folder):
+                match = pattern.fullmatch(name)
+                if match:
+                    realizations.add(int(match.group(1)))
+
+    return scenarios, levels, sorted(realizations)
+
+# ----- Create Empty Store -----
+def create_store(store_folder, scenarios, levels, realizations, time):
+
+    # Step 1: Drop the index of an earlier store first, so the store reads as incomplete until it is written again
+    os.makedirs(store_folder, exist_ok = True)
+    index_path = os.path.join(store_folder, "index.json")
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    # Step 2: Write the shared time axis
+    time = np.asarray(time, dtype = float)
+    np.save(os.path.join(store_folder, "time.npy"), time)
+    np.save(os.path.join(store_folder, "log_time.npy"), np.log(time))
+
+    # Step 3: Allocate the scenario x level x realization x time planes on disk
+    shape = (len(scenarios), len(levels), len(realizations), len(time))
+    rnp = np.lib.format.open_memmap(os.path.join(store_folder, "rnp.npy"), mode = "w+", dtype = np.float64, shape = shape)
+    log_rnp = np.lib.format.open_memmap(os.path.join(store_folder, "log_rnp.npy"), mode = "w+", dtype = np.float64, shape = shape)
+    rnp[...] = np.nan
+    log_rnp[...] = np.nan
+
+    return rnp, log_rnp
+
+# ----- Write Store Index -----
+def write_index(store_folder, scenarios, levels, realizations, number_time):
+
+    # The index marks the store as complete, so it is written last and swapped in atomically
+    index = {
+        "scenarios": list(scenarios),
+        "levels": [int(level) for level in levels],
+        "realizations": [int(realization) for realization in realizations],
+        "number_time": int(number_time)
+    }
+    index_path = os.path.join(store_folder, "index.json")
+    temporary_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding = "utf-8") as file:
+        json.dump(index, file, indent = 2)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, index_path)
+
+# ----- Pack Noisy RNP Model -----
+def pack_noisy_model(source_folder = "Noisy RNP Model", store_folder = "Noisy RNP Store"):
+
+    # Step 1: Discover the grid and read the time axis of the first file
+    scenarios, levels, realizations = discover_noisy_model(source_folder)
+    if not scenarios or not levels or not realizations:
+        raise ValueError(f"No noisy RNP data found in {source_folder}!")
+    file_paths = [os.path.join(source_folder, scenario, f"{level}%", f"noisy_data_{realization}.txt")
+                  for scenario in scenarios for level in levels for realization in realizations]
+    first_path = next(file_path for file_path in file_paths if os.path.exists(file_path))
+    time = np.array(Data_Reader.read_columns(first_path, skip_header = 1, cache = False)[0]) # days
+    rnp, log_rnp = create_store(store_folder, scenarios, levels, realizations, time)
+
+    # Step 2: Parse every realization once into its plane of the store
+    flat_rnp = rnp.reshape(-1, len(time))
+    flat_log_rnp = log_rnp.reshape(-1, len(time))
+    for row, file_path in enumerate(file_paths):
+        if not os.path.exists(file_path):
+            continue
+        noisy_time, noisy_RNP = Data_Reader.read_columns(file_path, skip_header = 1, cache = False)[:2]
+        if noisy_time.shape != time.shape or not np.array_equal(noisy_time, time):
+            raise ValueError(f"Time axis of {file_path} does not match the store!")
+        flat_rnp[row] = noisy_RNP
+        np.log(noisy_RNP, out = flat_log_rnp[row])
+
+    # Step 3: Flush every plane, then publish the index
+    rnp.flush()
+    log_rnp.flush()
+    del flat_rnp, flat_log_rnp, rnp, log_rnp
+    write_index(store_folder, scenarios, levels, realizations, len(time))
+
+    return NoisyRNPStore(store_folder)
+
+# ----- Noisy RNP Store -----
+class NoisyRNPStore:
+    """
+    Memory-mapped scenario x noise level x realization x time store.
+
+    The RNP and log(RNP) planes are opened read-only with mmap, so every
+    selection below is a zero-copy view and only the touched pages are read.
+    Missing realizations are stored as NaN.
+    """
+
+    def __init__(self, store_folder = "Noisy RNP Store"):
+
+        with open(os.path.join(store_folder, "index.json"), "r", encoding = "utf-8") as file:
+            index = json.load(file)
+
+        self.store_folder = store_folder
+        self.scenarios = index["scenarios"]
+        self.levels = index["levels"]
+        self.realizations = index["realizations"]
+        self.time = np.load(os.path.join(store_folder, "time.npy"), mmap_mode = "r") # days
+        self.log_time = np.load(os.path.join(store_folder, "log_time.npy"), mmap_mode = "r")
+        self.rnp = np.load(os.path.join(store_folder, "rnp.npy"), mmap_mode = "r") # psia2/cp-d/Mscf
+        self.log_rnp = np.load(os.path.join(store_folder, "log_rnp.npy"), mmap_mode = "r")
+
+    @property
+    def shape(self):
+        return self.rnp.shape
+
+    def scenario_index(self, scenario):
+        return self.scenarios.index(scenario)
+
+    def level_index(self, level):
+        return self.levels.index(int(str(level).rstrip("%")))
+
+    def realization_index(self, realization):
+        return self.realizations.index(int(realization))
+
+    def select(self, scenario = None, level = None, realization = None, log = False):
+
+        # Unspecified axes are kept whole, so the result is always a view
+        key = (slice(None) if scenario is None else self.scenario_index(scenario),
+               slice(None) if level is None else self.level_index(level),
+               slice(None) if realization is None else self.realization_index(realization))
+        planes = self.log_rnp if log else self.rnp
+
+        return planes[key]
+
+    def flat(self, log = False):
+
+        # All realizations as a (series x time) stack, still without copying
+        planes = self.log_rnp if log else self.rnp
+
+        return planes.reshape(-1, planes.shape[-1])
+
+    def labels(self):
+
+        # Scenario, level and realization of every row of flat()
+        return [(scenario, level, realization) for scenario in self.scenarios for level in self.levels for realization in self.realizations]
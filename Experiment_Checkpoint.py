@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Experiment Checkpoint and Resume
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import hashlib
+import json
+import numpy as np
+import Results_Sink
+
+# ----- Content Hashes -----
+def content_hashes(store, true_RNP = None):
+
+    # Step 1: Fold the true curve into every hash, since the residuals depend on it
+    base = hashlib.sha256()
+    if true_RNP is not None:
+        base.update(np.ascontiguousarray(true_RNP, dtype = np.float64).tobytes())
+
+    # Step 2: Hash the content of every noisy data set of the store
+    hashes = {}
+    for i, scenario in enumerate(store.scenarios):
+        for j, level in enumerate(store.levels):
+            for k, realization in enumerate(store.realizations):
+                digest = base.copy()
+                digest.update(np.ascontiguousarray(store.rnp[i, j, k]).tobytes())
+                hashes[(scenario, level, realization)] = digest.hexdigest()
+
+    return hashes
+
+# ----- Task Key -----
+def task_key(content_hash, method, parameters):
+
+    # Any change of data, method or hyperparameters gives a new key
+    text = "\n".join([content_hash, method, json.dumps(parameters, sort_keys = True)])
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ----- Experiment Checkpoint -----
+class ExperimentCheckpoint:
+    """Completion manifest of finished data sets, kept as an append-only results journal."""
+
+    def __init__(self, manifest_path, columns, buffer_size = 256, flush_interval = 2.0):
+
+        # Step 1: Reopen the journal and index its complete records by key, latest record last
+        self.sink = Results_Sink.ResultsSink(manifest_path, ("Key",) + tuple(columns), buffer_size, flush_interval)
+        self.entries = {}
+        for key, *record in self.sink.records():
+            self.entries.pop(key, None)
+            self.entries[key] = tuple(record)
+
+    def done(self, key):
+
+        return key in self.entries
+
+    def record(self, key, record):
+
+        self.sink.append((key,) + tuple(record))
+        self.entries.pop(key, None)
+        self.entries[key] = tuple(record)
+
+    def records(self):
+
+        self.sink.flush()
+        return list(self.entries.values())
+
+    def close(self):
+
+        self.sink.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-Well Fleet Processing
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import Data_Reader
+import Flow_Regime_Segmentation
+import Linear_Flow_Analysis
+import Pseudopressure_Conversion
+import Results_Sink
+import Smoothing_Experiment
+import Streaming_Conversion
+
+# Per-well summary columns of the fleet output; wells without a linear-flow segment are marked skipped in status, with NaN results
+summary_fields = ("well", "pvt_table", "samples", "status", "linear_start(days)", "linear_end(days)",
+                  "noisy_slope", "noisy_r_squared", "noisy_kxf(md-ft2)", "smoothed_slope", "smoothed_r_squared", "smoothed_kxf(md-ft2)")
+
+# ----- Read Manifest -----
+def read_manifest(file_path):
+
+    # Tab-separated table with a header line, one dictionary per row
+    with open(file_path, "r", encoding = "utf-8") as file:
+        lines = [line.rstrip("\r\n") for line in file if line.strip()]
+    header = lines[0].split("\t")
+
+    return [dict(zip(header, line.split("\t"))) for line in lines[1:]]
+
+# ----- Load PVT Tables -----
+def load_pvt_tables(pvt_files, integration_method = "trapezoid"):
+
+    # Read every distinct PVT table and integrate its m(p) once with the given rule
+    tables = {}
+    for table_id, gas_properties_file_path in pvt_files.items():
+        pvt_pressure, pvt_Z, pvt_mug, pvt_cg = Pseudopressure_Conversion.read_gas_properties(gas_properties_file_path) # psia, , cp, 1/psi
+        pvt_pseudopressure = Pseudopressure_Conversion.calculate_pseudopressure(pvt_pressure, pvt_mug, pvt_Z, integration_method) # psia2/cp
+        tables[table_id] = (pvt_pressure, pvt_Z, pvt_mug, pvt_cg, pvt_pseudopressure)
+
+    return tables
+
+_worker = {}
+
+def _initialize_worker(shared):
+
+    # Attach the shared axes, properties and slopes of every PVT table once per process and
+    # build the lookup tables on them, so the workers hold no private copy of the tables
+    _worker.clear()
+    _worker["tables"] = {}
+    for table_id, (cf, arrays) in shared.items():
+        views = []
+        for name, (block_name, shape) in arrays.items():
+            block = shared_memory.SharedMemory(name = block_name)
+            _worker[f"{table_id}_{name}_block"] = block
+            views.append(np.ndarray(shape, dtype = np.float64, buffer = block.buf))
+        _worker["tables"][table_id] = Pseudopressure_Conversion.PVTTable.from_arrays(*views, cf = cf)
+
+# ----- Process One Well -----
+def process_well(well, method = "Lowess", parameters = None):
+
+    # Step 1: Read the gauge files of the well (two header lines, time in hours)
+    table = _worker["tables"][well["PVT_Table"]]
+    time, bhp = Data_Reader.read_columns(well["BHP_File"], skip_header = 2)[:2] # hrs., psia
+    rate = Data_Reader.read_columns(well["Rate_File"], skip_header = 2)[1] # Mscf/d
+    if len(rate) != len(time):
+        raise ValueError(f"Dimensions of bottomhole pressure and rate not match for well {well['Well']}!")
+    chunk = (np.asarray(time) / 24, bhp, rate) # days, psia, Mscf/d
+    if well.get("Reservoir_File"):
+        chunk += (Data_Reader.read_columns(well["Reservoir_File"], skip_header = 2)[1],) # psia
+        initial_pressure = float(chunk[3][0]) # psia
+    if well.get("Initial_Pressure"):
+        initial_pressure = float(well["Initial_Pressure"]) # psia
+    elif len(chunk) < 4:
+        raise ValueError(f"Initial pressure or reservoir pressure needed for well {well['Well']}!")
+
+    # Step 2: Convert to RNP and pseudotime, keeping the flowing samples
+    records = next(Streaming_Conversion.convert_stream([chunk], table, initial_pressure))
+    flowing = (np.asarray(rate) > 0) & (records["time"] > 0) & (records["RNP"] > 0)
+    time, pseudotime, RNP = records["time"][flowing], records["pseudotime"][flowing], records["RNP"][flowing]
+
+    # Step 3: Smooth in log-log space
+    parameters = {"span": 5} if parameters is None else parameters
+    smoothed_RNP = np.exp(Smoothing_Experiment.methods[method](np.log(time), np.log(RNP)[None, :], **parameters)[0])
+
+    # Step 4: Linear flow window from the regime segmentation of the smoothed RNP; a well with no segment
+    # within 0.05 of the half slope is skipped rather than analyzed over a window that is not linear flow
+    noise_std = np.sqrt(Flow_Regime_Segmentation.noise_variance(np.log(RNP)))
+    segments = Flow_Regime_Segmentation.segment_regimes(time, smoothed_RNP, noise_std = noise_std)
+    linear_flow = Flow_Regime_Segmentation.linear_flow_segment(segments, desired_slope = 0.5, slope_tolerance = 0.05)
+    series = np.vstack((time, pseudotime, RNP, smoothed_RNP))
+    if linear_flow is None:
+        return (well["Well"], well["PVT_Table"], len(time), "skipped: no linear flow", *[np.nan] * 8), series
+    mask = np.zeros(len(time), dtype = bool)
+    mask[linear_flow["start"]:linear_flow["end"] + 1] = True
+
+    # Step 5: Linear flow analysis of the noisy and smoothed RNP, at the well's initial viscosity and compressibility
+    mug_i, ct_i = table.lookup(np.array([initial_pressure]), properties = ("mug", "ct"))[:, 0]
+    properties = dict(Linear_Flow_Analysis.reservoir_properties, miugi = mug_i)
+    for name in ("T", "h", "phi"):
+        if well.get(name):
+            properties[name] = float(well[name])
+    analysis = Linear_Flow_Analysis.analyze_linear_flow(np.sqrt(pseudotime), np.vstack((RNP, smoothed_RNP)), mask, ct_i, properties = properties)
+
+    summary = (well["Well"], well["PVT_Table"], len(time), "ok", float(time[linear_flow["start"]]), float(time[linear_flow["end"]]),
+               *(float(analysis[name][0]) for name in ("slope", "r_squared", "kxf")),
+               *(float(analysis[name][1]) for name in ("slope", "r_squared", "kxf")))
+
+    return summary, series
+
+# ----- Run Fleet -----
+def run_fleet(wells, pvt_files, output_folder = "Fleet Results", method = "Lowess", parameters = None, cf = 3e-6,
+              integration_method = "trapezoid", max_workers = None):
+
+    # Step 1: Load each distinct PVT table once and place its sorted axis, properties and slopes in shared memory
+    used = sorted({well["PVT_Table"] for well in wells})
+    missing = [table_id for table_id in used if table_id not in pvt_files]
+    if missing:
+        raise ValueError(f"Unknown PVT tables: {', '.join(missing)}")
+    blocks = []
+    shared = {}
+    for table_id, (pvt_pressure, pvt_Z, pvt_mug, pvt_cg, pvt_pseudopressure) in load_pvt_tables(
+            {table_id: pvt_files[table_id] for table_id in used}, integration_method).items():
+        table = Pseudopressure_Conversion.PVTTable(pvt_pressure, pvt_Z, pvt_mug, pvt_cg, cf, pvt_pseudopressure)
+        arrays = {}
+        for name in ("pressure", "values", "slopes"):
+            block, arrays[name] = Smoothing_Experiment.share_array(getattr(table, name))
+            blocks.append(block)
+        shared[table_id] = (table.cf, arrays)
+
+    # Step 2: Fan the wells out over a process pool
+    summaries = []
+    series = []
+    try:
+        if max_workers == 1:
+            _initialize_worker(shared)
+            results = [process_well(well, method, parameters) for well in wells]
+        else:
+            with ProcessPoolExecutor(max_workers = max_workers, initializer = _initialize_worker, initargs = (shared,)) as executor:
+                results = list(executor.map(process_well, wells, [method] * len(wells), [parameters] * len(wells), chunksize = 8))
+        for summary, well_series in results:
+            summaries.append(summary)
+            series.append(well_series)
+    finally:
+        _worker.clear()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    # Step 3: Collect every well into one columnar output, the series concatenated with per-well offsets
+    os.makedirs(output_folder, exist_ok = True)
+    columns = {field: np.array([summary[k] for summary in summaries]) for k, field in enumerate(summary_fields)}
+    offsets = np.concatenate(([0], np.cumsum([well_series.shape[1] for well_series in series])))
+    stacked = np.hstack(series) if series else np.empty((4, 0))
+    temporary_path = os.path.join(output_folder, f"fleet_results.{os.getpid()}.tmp.npz")
+    np.savez(temporary_path, offsets = offsets, time = stacked[0], pseudotime = stacked[1], RNP = stacked[2], smoothed_RNP = stacked[3],
+             **{field.split("(")[0]: values for field, values in columns.items()})
+    os.replace(temporary_path, os.path.join(output_folder, "fleet_results.npz"))
+    Results_Sink.write_table(os.path.join(output_folder, "fleet_summary.txt"), summary_fields, summaries)
+
+    return columns
+
+# ----- Main Execution -----
+def main():
+
+    # Wells: Well, PVT_Table, BHP_File, Rate_File[, Reservoir_File, Initial_Pressure, T, h, phi]
+    # PVT tables: PVT_Table, Gas_Properties_File
+    wells = read_manifest("wells_manifest.txt")
+    pvt_files = {row["PVT_Table"]: row["Gas_Properties_File"] for row in read_manifest("pvt_manifest.txt")}
+    columns = run_fleet(wells, pvt_files)
+    print("----- Fleet Processing:", len(columns["well"]), "wells,", int(np.sum(columns["status"] != "ok")), "skipped -----")
+
+if __name__ == "__main__":
+    main()
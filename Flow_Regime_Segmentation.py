@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Flow Regime Segmentation
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+import Slope_Interval_Search
+
+# Fields of every segment returned by the segmentation; end is inclusive
+segment_fields = ("start", "end", "slope", "intercept")
+
+# ----- Segment Cost -----
+def segment_cost(moments, start, end):
+
+    # Residual sum of squares of the straight-line fit over [start, end), in O(1) per segment and per series
+    start, end = np.broadcast_arrays(start, end)
+    sx, sy, sxx, syy, sxy = moments[..., end] - moments[..., start]
+    length = end - start
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        sxx_centered = sxx - sx * sx / length
+        sxy_centered = sxy - sx * sy / length
+        syy_centered = syy - sy * sy / length
+        cost = syy_centered - np.where(sxx_centered > 0, sxy_centered * sxy_centered / sxx_centered, 0)
+
+    return np.maximum(cost, 0)
+
+# ----- Noise Variance -----
+def noise_variance(y):
+
+    # Mean square of the first differences of every series; a median-based estimate would ignore noise that hits only part of the points
+    differences = np.diff(np.asarray(y, dtype = float), axis = -1)
+
+    return np.maximum(np.mean(differences * differences, axis = -1) / 2, np.finfo(float).tiny)
+
+# ----- Segment Regimes -----
+def segment_regimes(x, y, log = True, penalty = None, noise_std = None, min_size = 5):
+
+    # Step 1: Work in log-log space by default and build the prefix sums of every series once
+    x = np.asarray(x, dtype = float)
+    y = np.asarray(y, dtype = float)
+    if log:
+        x = np.log(x)
+        y = np.log(y)
+    series = np.atleast_2d(y)
+    n = len(x)
+    if series.shape[-1] != n or x.ndim != 1:
+        raise ValueError("Dimensions of x and y not match!")
+    if min_size < 2:
+        raise ValueError("Segments need at least 2 points!")
+    if n < min_size:
+        raise ValueError("Not enough points to segment!")
+    x_mean = x.mean()
+    y_mean = series.mean(axis = 1)
+    x_centered = np.broadcast_to(x - x_mean, series.shape)
+    y_centered = series - y_mean[:, None]
+    moments = np.zeros((5, len(series), n + 1))
+    np.cumsum(np.stack((x_centered, y_centered, x_centered * x_centered, y_centered * y_centered, x_centered * y_centered)), axis = 2, out = moments[:, :, 1:])
+
+    # Step 2: BIC penalty for a slope, an intercept and a changepoint, scaled by the noise variance of every series
+    # (a smoothed curve should be given the noise level of its raw data, since smoothing hides it)
+    if penalty is None:
+        variance = noise_variance(series) if noise_std is None else np.asarray(noise_std, dtype = float) ** 2
+        penalty = 3 * variance * np.log(n)
+    penalty = np.broadcast_to(np.asarray(penalty, dtype = float), (len(series),))
+
+    # Step 3: Optimal partitioning of all series together, with PELT pruning of the candidate last changepoints;
+    # a candidate beaten at `end` in every series is dropped only min_size points later, once a segment may start at `end`
+    rows = np.arange(len(series))
+    total = np.full((len(series), n + 1), np.inf)
+    total[:, 0] = -penalty
+    previous = np.zeros((len(series), n + 1), dtype = int)
+    candidates = np.array([0])
+    pruned = []
+    for end in range(min_size, n + 1):
+        if end - min_size >= min_size:
+            candidates = np.append(candidates, end - min_size)
+        if len(pruned) == min_size:
+            candidates = candidates[~np.isin(candidates, pruned.pop(0))]
+        costs = total[:, candidates] + segment_cost(moments, candidates, end)
+        best = np.argmin(costs, axis = 1)
+        total[:, end] = costs[rows, best] + penalty
+        previous[:, end] = candidates[best]
+        pruned.append(candidates[np.all(costs > total[:, end, None], axis = 0)])
+
+    # Step 4: Trace the changepoints of every series back from the end
+    segmentations = []
+    for k in rows:
+        boundaries = [n]
+        while boundaries[-1] > 0:
+            boundaries.append(previous[k, boundaries[-1]])
+        boundaries = np.array(boundaries[::-1])
+
+        # Step 5: Slope and intercept of every segment from the same prefix sums
+        start, end = boundaries[:-1], boundaries[1:]
+        slope, intercept, _ = Slope_Interval_Search.window_regression(moments[:, k], x_mean, y_mean[k], start, end - start)
+        segmentations.append({"start": start, "end": end - 1, "slope": slope, "intercept": intercept})
+
+    # One segmentation for a single series, a list of them for a (series x time) stack
+    return segmentations if y.ndim > 1 else segmentations[0]
+
+# ----- Linear Flow Segment -----
+def linear_flow_segment(segments, desired_slope = 0.5, slope_tolerance = 0.05):
+
+    # Pick the segment with the slope closest to the linear-flow slope, the longest one on ties,
+    # and none when no segment is within the tolerance (pass None to accept the closest one anyway)
+    slope_error = np.abs(segments["slope"] - desired_slope)
+    length = segments["end"] - segments["start"] + 1
+    order = np.lexsort((-length, slope_error))
+    if not len(order) or (slope_tolerance is not None and slope_error[order[0]] > slope_tolerance):
+        return None
+
+    return {field: segments[field][order[0]].item() for field in segment_fields}
+
+# ----- Linear Flow Window -----
+def linear_flow_window(time, RNP, noise_std = None, desired_slope = 0.5, slope_tolerance = 0.05, search_end_time = 5000):
+
+    # Step 1: The linear-flow segment of the flow-regime segmentation of every series, when one is within the tolerance
+    time = np.asarray(time, dtype = float)
+    RNP = np.asarray(RNP, dtype = float)
+    series = np.atleast_2d(RNP)
+    segmentations = segment_regimes(time, series, noise_std = noise_std)
+    stop = int(np.searchsorted(time, search_end_time, side = "right"))
+
+    # Step 2: Otherwise the longest well-correlated half-slope interval up to search_end_time, as the original interval scan;
+    # None when there is neither
+    windows = []
+    for segments, values in zip(segmentations, series):
+        linear_flow = linear_flow_segment(segments, desired_slope, slope_tolerance)
+        if linear_flow is None:
+            linear_flow = Slope_Interval_Search.best_interval(time[:stop], values[:stop], desired_slope = desired_slope)
+        windows.append(linear_flow)
+
+    # One window for a single series, a list of them for a (series x time) stack
+    return windows if RNP.ndim > 1 else windows[0]
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Linear Flow Analysis
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import numpy as np
+import warnings
+import Dataset_Store
+import Data_Reader
+import Flow_Regime_Segmentation
+import Pseudopressure_Conversion
+import Results_Sink
+import Smoothing_Experiment
+
+# Reservoir properties of the synthetic model
+reservoir_properties = {
+    "T": 212, # deg.Fahrenheit
+    "h": 100, # ft
+    "phi": 0.05, # fraction
+    "miugi": 0.026527595 # cp
+}
+
+# ----- Linear Flow Masks -----
+def linear_flow_masks(time, RNP, noise_std = None):
+
+    # Window of every series from its own flow-regime segmentation (or the half-slope interval scan);
+    # a series without a linear-flow window gets an empty row
+    RNP = np.atleast_2d(np.asarray(RNP, dtype = float))
+    windows = Flow_Regime_Segmentation.linear_flow_window(time, RNP, noise_std = noise_std)
+    masks = np.zeros(RNP.shape, dtype = bool)
+    for k, window in enumerate(windows):
+        if window is not None:
+            masks[k, window["start"]:window["end"] + 1] = True
+
+    return masks
+
+# ----- Masked Linear Regression -----
+def linear_flow_regression(sqrt_pseudotime, RNP, mask):
+
+    # Step 1: Weights of the points inside every series' window
+    x = np.asarray(sqrt_pseudotime, dtype = float)
+    RNP = np.asarray(RNP, dtype = float)
+    mask = np.asarray(mask, dtype = bool)
+    shape = np.broadcast_shapes(RNP.shape, mask.shape)
+    RNP = np.broadcast_to(RNP, shape)
+    weights = np.broadcast_to(mask, shape).astype(float)
+    count = weights.sum(axis = -1)
+
+    # Step 2: Masked means, then centered sums to keep the large RNP values well conditioned
+    # (windows of fewer than 2 points give NaN)
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        x_mean = np.einsum("...t,t->...", weights, x) / count
+        y_mean = np.einsum("...t,...t->...", weights, np.where(weights > 0, RNP, 0)) / count
+        x_centered = np.where(weights > 0, x - x_mean[..., None], 0)
+        y_centered = np.where(weights > 0, RNP - y_mean[..., None], 0)
+        sxx = np.einsum("...t,...t->...", x_centered, x_centered)
+        sxy = np.einsum("...t,...t->...", x_centered, y_centered)
+        syy = np.einsum("...t,...t->...", y_centered, y_centered)
+
+        # Step 3: Slope, intercept and R-squared of RNP against the square root of pseudotime
+        slope = np.where(count >= 2, sxy / sxx, np.nan)
+        intercept = y_mean - slope * x_mean
+        r_squared = sxy * sxy / (sxx * syy)
+
+    return slope, intercept, r_squared
+
+# ----- Permeability-Half-Length Product -----
+def kxf_square(slope, cti, T = 212, h = 100, phi = 0.05, miugi = 0.026527595):
+
+    # k*xf^2 from the linear flow slope, md-ft2
+    return ((40.93 * T) / (slope * h * np.sqrt(phi * miugi * cti))) ** 2
+
+# ----- Analyze Linear Flow -----
+def analyze_linear_flow(sqrt_pseudotime, RNP, mask, cti, true_RNP = None, properties = reservoir_properties, true_mask = None):
+
+    # Step 1: Regress every series of the stack at once
+    slope, intercept, r_squared = linear_flow_regression(sqrt_pseudotime, RNP, mask)
+    analysis = {"slope": slope, "intercept": intercept, "r_squared": r_squared, "kxf": kxf_square(slope, cti, **properties)}
+
+    # Step 2: Relative error of k*xf^2 against the true RNP, over its own window when one is given and the same window otherwise
+    if true_RNP is not None:
+        true_slope = linear_flow_regression(sqrt_pseudotime, true_RNP, mask if true_mask is None else true_mask)[0]
+        true_kxf = kxf_square(true_slope, cti, **properties)
+        analysis["kxf_error"] = (analysis["kxf"] - true_kxf) / true_kxf
+
+    return analysis
+
+# ----- Linear Flow Table -----
+def linear_flow_table(groups, time, sqrt_pseudotime, cti, true_RNP, true_mask, properties = reservoir_properties):
+
+    # groups maps (method, parameters, scenario, level) to (data set numbers, stack of RNP series, their window masks)
+    time = np.asarray(time, dtype = float)
+    rows = []
+    summary = []
+    for (method, parameters, scenario, level), (data_set_numbers, RNP, masks) in groups.items():
+        analysis = analyze_linear_flow(sqrt_pseudotime, RNP, masks, cti, true_RNP, properties, true_mask)
+        fields = [analysis[name] for name in ("slope", "r_squared", "kxf", "kxf_error")]
+        found = masks.any(axis = 1)
+        for k, data_set_number in enumerate(data_set_numbers):
+            window = time[masks[k]]
+            bounds = (float(window[0]), float(window[-1])) if found[k] else (np.nan, np.nan)
+            rows.append((method, parameters, scenario, level, data_set_number, *bounds, *(float(values[k]) for values in fields)))
+
+        # Means over the data sets with a linear-flow window
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category = RuntimeWarning)
+            summary.append((method, parameters, scenario, level, int(found.sum()), *(float(np.nanmean(values)) for values in fields),
+                            float(np.nanmean(np.abs(analysis["kxf_error"])))))
+
+    return rows, summary
+
+# ----- Smoothed Groups -----
+def smoothed_groups(store, grid, scenarios = None, levels = None):
+
+    # Smooth every scenario and level of the store in memory, one stack per method, parameter set, scenario and level;
+    # a smoothed series is segmented at the noise level of its noisy data set, since smoothing hides it
+    scenarios = store.scenarios if scenarios is None else scenarios
+    levels = store.levels if levels is None else levels
+    time = np.asarray(store.time)
+    log_time = np.asarray(store.log_time)
+    groups = {}
+    for scenario in scenarios:
+        for level in levels:
+            data_set_numbers = [180 + store.level_index(level) * len(store.realizations) + k + 1 for k in range(len(store.realizations))]
+            log_RNP = np.asarray(store.select(scenario, level, log = True))
+            noise_std = np.sqrt(Flow_Regime_Segmentation.noise_variance(log_RNP))
+            for method, parameter_sets in grid.items():
+                for parameters in parameter_sets:
+                    if method == "Noisy":
+                        RNP = np.asarray(store.select(scenario, level))
+                        masks = linear_flow_masks(time, RNP)
+                    else:
+                        RNP = np.exp(Smoothing_Experiment.methods[method](log_time, log_RNP, **parameters))
+                        masks = linear_flow_masks(time, RNP, noise_std)
+                    label = Smoothing_Experiment.parameter_label(parameters)
+                    groups[(method, label, scenario, level)] = (data_set_numbers, RNP, masks)
+
+    return groups
+
+# ----- Main Execution -----
+def main(true_RNP_file_path = "true_RNP.txt", source_folder = "Noisy RNP Model", store_folder = "Noisy RNP Store",
+         gas_properties_file_path = os.path.join("Synthetic Model", "gas_properties.txt"),
+         bhp_file_path = os.path.join("Synthetic Model", "bhp.txt"),
+         reservoir_file_path = os.path.join("Synthetic Model", "res_pressure.txt"), output_folder = "Linear Flow Analysis"):
+
+    # Step 1: True RNP, the noisy store and the pseudotime of the synthetic model; the gauge and PVT exports of the
+    # synthetic model of Munthe and Lee (2024) are not distributed with the corpus and are passed in from where they are kept
+    missing = [file_path for file_path in (true_RNP_file_path, gas_properties_file_path, bhp_file_path, reservoir_file_path)
+               if not os.path.exists(file_path)]
+    if missing:
+        raise ValueError(f"Synthetic model files not found: {', '.join(missing)}!")
+    true_time, true_RNP = Data_Reader.read_columns(true_RNP_file_path, skip_header = 1)[:2] # days, psia2/cp-d/Mscf
+    if not os.path.exists(os.path.join(store_folder, "index.json")):
+        Dataset_Store.pack_noisy_model(source_folder, store_folder)
+    store = Dataset_Store.NoisyRNPStore(store_folder)
+    conversion = Pseudopressure_Conversion.PseudopressureConversion.from_files(gas_properties_file_path, bhp_file_path, reservoir_file_path)
+    sqrt_pseudotime = np.sqrt(np.asarray(conversion.pseudotime)[1:]) # days^1/2
+    if len(sqrt_pseudotime) != len(true_time) or len(store.time) != len(true_time):
+        raise ValueError("Dimensions of pseudotime and RNP not match!")
+
+    # Step 2: Linear flow analysis of the noisy RNP and of every smoothing method and parameter set of the paper,
+    # each series over its own linear-flow window and the true RNP over the true one
+    grid = {"Noisy": [{}], **Smoothing_Experiment.paper_grid()}
+    groups = smoothed_groups(store, grid)
+    true_mask = linear_flow_masks(true_time, true_RNP)[0]
+    rows, summary = linear_flow_table(groups, store.time, sqrt_pseudotime, conversion.cti, true_RNP, true_mask)
+
+    # Step 3: Export the per data set and the summary tables
+    os.makedirs(output_folder, exist_ok = True)
+    Results_Sink.write_table(os.path.join(output_folder, "linear_flow_results.txt"),
+                             ("Method", "Parameters", "Scenario", "Level", "Data_Set", "Linear_Start(days)", "Linear_End(days)",
+                              "Slope", "R_Squared", "kxf(md-ft2)", "kxf_Error"), rows)
+    Results_Sink.write_table(os.path.join(output_folder, "linear_flow_summary.txt"),
+                             ("Method", "Parameters", "Scenario", "Level", "Windows", "Slope", "R_Squared", "kxf(md-ft2)", "kxf_Error",
+                              "Abs_kxf_Error"), summary)
+    print("----- Linear Flow Analysis:", len(rows), "data sets -----")
+
+if __name__ == "__main__":
+    main()
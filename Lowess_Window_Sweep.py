@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Lowess Window Size Sweep
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import numpy as np
+import Data_Reader
+import Dataset_Store
+import Smoothing_Operators
+
+# ----- Window Sweep -----
+def lowess_window_sweep(log_RNP, true_RNP, spans = range(3, 101, 2)):
+
+    # MATLAB smooth(logRNP, span, "lowess") takes the tricube-weighted mean of the span
+    # at interior points, with w(k) = (1 - |k|^3/h^3)^3 = 1 - 3|k|^3/h^3 + 3|k|^6/h^6 - |k|^9/h^9.
+    # The numerator is therefore a combination of the moments M_p = sum |k|^p y(i + k),
+    # which grow by h^p (y(i - h) + y(i + h)) from one half-width to the next.
+
+    # Step 1: Check the spans against the data
+    log_RNP = np.atleast_2d(np.asarray(log_RNP, dtype = float))
+    true_RNP = np.asarray(true_RNP, dtype = float)
+    m, n = log_RNP.shape
+    spans = np.array(sorted({Smoothing_Operators.lowess_span(span, n) for span in spans}))
+    if spans.min() < 3:
+        raise ValueError("Lowess spans must be at least 3!")
+    sse = np.empty((m, len(spans)))
+
+    # Step 2: Running moments M_0, M_3, M_6, M_9, starting from h = 1 where only y(i) has weight
+    powers = np.array([0, 3, 6, 9])
+    moments = np.zeros((len(powers), m, n))
+    moments[0] = log_RNP
+    denominator = np.array([1.0, 0.0, 0.0, 0.0])
+    smoothed = np.empty((m, n))
+    scale = 1 / (0.3413 * true_RNP)
+    h = 1
+
+    for j, span in enumerate(spans):
+        target = (span - 1) // 2
+
+        # Step 3: Grow the moments to the half-width of this span, reusing the previous one
+        while h < target:
+            pair = log_RNP[:, 2 * h:] + log_RNP[:, :n - 2 * h]
+            step = float(h) ** powers
+            moments[:, :, h:n - h] += step[:, None, None] * pair
+            denominator += 2 * step
+            h += 1
+
+        # Step 4: Interior points from the moments, end points from the one-sided fits
+        combination = np.array([1.0, -3.0, 3.0, -1.0]) / float(h) ** powers
+        combination /= combination @ denominator
+        np.einsum("p,pmn->mn", combination, moments[:, :, h:n - h], out = smoothed[:, h:n - h])
+        edge = Smoothing_Operators.lowess_edge_coefficients(span)
+        smoothed[:, :h] = log_RNP[:, :span - 1] @ edge.T
+        smoothed[:, n - h:] = (log_RNP[:, ::-1][:, :span - 1] @ edge.T)[:, ::-1]
+
+        # Step 5: SSE of the relative residuals against the true RNP
+        np.exp(smoothed, out = smoothed)
+        smoothed -= true_RNP
+        smoothed *= scale
+        sse[:, j] = np.einsum("ij,ij->i", smoothed, smoothed)
+
+    best = np.argmin(sse, axis = 1)
+
+    return spans, sse, spans[best], sse[np.arange(m), best]
+
+# ----- Main Execution -----
+def main():
+
+    # Step 1: Load the true RNP and every noisy data set from the packed store
+    true_time, true_RNP = Data_Reader.read_columns("true_RNP.txt", skip_header = 1)[:2] # days, psia2/cp-d/Mscf
+    if not os.path.exists(os.path.join("Noisy RNP Store", "index.json")):
+        Dataset_Store.pack_noisy_model("Noisy RNP Model", "Noisy RNP Store")
+    store = Dataset_Store.NoisyRNPStore("Noisy RNP Store")
+
+    # Step 2: Sweep every window size for all data sets at once
+    spans, sse, best_span, best_sse = lowess_window_sweep(store.flat(log = True), true_RNP, range(3, 101, 2))
+
+    # Step 3: Export the SSE-versus-window curves and the optimal window of every data set
+    output_folder = os.path.join("Smoothing Methods", "Lowess")
+    os.makedirs(output_folder, exist_ok = True)
+    sweep_file_path = os.path.join(output_folder, "SSE_window_sweep.txt")
+    with open(sweep_file_path, "w") as file:
+        # Write the header
+        file.write("Scenario\tNoise_Level\tRealization\tBest_Window\tBest_SSE\t" + "\t".join(f"SSE_{span}" for span in spans) + "\n")
+
+        # Write the data to the file
+        for (scenario, level, realization), span, best, curve in zip(store.labels(), best_span, best_sse, sse):
+            file.write(f"{scenario}\t{level}%\t{realization}\t{span}\t{best}\t" + "\t".join(str(value) for value in curve) + "\n")
+
+    print("--- Lowess Window Sweep Complete ---")
+    return
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Moving Average Engine
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+
+# ----- Sample Window Bounds -----
+def window_bounds(n, window, alignment = "centered", edge = "symmetric"):
+
+    # Step 1: Bounds [start, stop) of the window of every point
+    window = int(window)
+    if window < 1:
+        raise ValueError("Moving average window must be at least 1!")
+    index = np.arange(n)
+    if alignment == "centered":
+        before, after = (window - 1) // 2, window // 2
+    elif alignment == "trailing":
+        before, after = window - 1, 0
+    else:
+        raise ValueError(f"Unknown window alignment: {alignment}")
+
+    # Step 2: Handle the windows that run past the ends
+    if edge == "symmetric":
+        # Shrink the window symmetrically near the ends, as in MATLAB smooth
+        if alignment != "centered":
+            raise ValueError("Symmetric edges need centered windows!")
+        reach = np.minimum(before, np.minimum(index, n - 1 - index))
+        start, stop = index - reach, index + reach + 1
+    elif edge in ("shrink", "nan"):
+        start, stop = index - before, index + after + 1
+    else:
+        raise ValueError(f"Unknown edge handling: {edge}")
+    complete = (start >= 0) & (stop <= n)
+
+    return np.clip(start, 0, n), np.clip(stop, 0, n), complete
+
+# ----- Time Window Bounds -----
+def time_window_bounds(x, width, alignment = "centered", edge = "symmetric"):
+
+    # Step 1: Reach of the window of every point in x (e.g. log(t)), which must be sorted
+    x = np.asarray(x, dtype = float)
+    if alignment == "centered":
+        before = after = np.full(len(x), width / 2)
+    elif alignment == "trailing":
+        before, after = np.full(len(x), float(width)), np.zeros(len(x))
+    else:
+        raise ValueError(f"Unknown window alignment: {alignment}")
+    complete = (x - before >= x[0]) & (x + after <= x[-1])
+
+    # Step 2: Shrink the reach symmetrically near the ends, as for sample windows
+    if edge == "symmetric":
+        if alignment != "centered":
+            raise ValueError("Symmetric edges need centered windows!")
+        before = after = np.minimum(before, np.minimum(x - x[0], x[-1] - x))
+    elif edge not in ("shrink", "nan"):
+        raise ValueError(f"Unknown edge handling: {edge}")
+
+    # Step 3: Bounds [start, stop) by binary search
+    start = np.searchsorted(x, x - before, side = "left")
+    stop = np.searchsorted(x, x + after, side = "right")
+
+    return start, stop, complete
+
+# ----- Moving Average -----
+def moving_average(y, windows = 5, alignment = "centered", edge = "symmetric", x = None):
+
+    # Step 1: One cumulative sum along time serves every window
+    y = np.asarray(y, dtype = float)
+    n = y.shape[-1]
+    cumulative = np.zeros(y.shape[:-1] + (n + 1,))
+    np.cumsum(y, axis = -1, out = cumulative[..., 1:])
+    single = np.ndim(windows) == 0
+    windows = np.atleast_1d(windows)
+    averages = np.empty((len(windows),) + y.shape)
+
+    # Step 2: Each window is one difference of the cumulative sum, O(n) per window,
+    # with windows counted in samples or, when x is given, as widths in x
+    for k, window in enumerate(windows):
+        if x is None:
+            start, stop, complete = window_bounds(n, window, alignment, edge)
+        else:
+            start, stop, complete = time_window_bounds(x, window, alignment, edge)
+        np.subtract(cumulative[..., stop], cumulative[..., start], out = averages[k])
+        averages[k] /= stop - start
+        if edge == "nan":
+            averages[k][..., ~complete] = np.nan
+
+    return averages[0] if single else averages
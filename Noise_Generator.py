@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo Noise Scenario Generator
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import hashlib
+import numpy as np
+import Data_Reader
+
+# Last time of every flow regime of the synthetic model, days
+regime_end_times = {"Transient": 3970, "Transition": 39956, "BDF": np.inf}
+
+# ----- Regime Segments -----
+def regime_segments(time):
+
+    # Bounds [start, stop) of every flow regime on the time axis
+    time = np.asarray(time, dtype = float)
+    segments = {}
+    start = 0
+    for regime, end_time in regime_end_times.items():
+        stop = int(np.searchsorted(time, end_time, side = "right"))
+        segments[regime] = (start, stop)
+        start = stop
+
+    return segments
+
+def scenario_regimes(scenario):
+
+    # "All" covers every regime, other scenarios join regime names with "-"
+    regimes = tuple(regime_end_times) if scenario == "All" else tuple(scenario.split("-"))
+    unknown = [regime for regime in regimes if regime not in regime_end_times]
+    if unknown:
+        raise ValueError(f"Unknown flow regimes: {', '.join(unknown)}")
+
+    return regimes
+
+# ----- Counter-Based Streams -----
+def stream_key(seed, scenario, level):
+
+    # 128-bit Philox key from a stable hash, so every (seed, scenario, level) has its own stream
+    digest = hashlib.sha256(f"{int(seed)}/{scenario}/{level}".encode("utf-8")).digest()
+
+    return np.frombuffer(digest[:16], dtype = np.uint64).copy()
+
+def raw_block(key, start, count, stride):
+
+    # Realization i starts at counter i * stride, and every counter step gives 4 raw 64-bit words,
+    # so a run of realizations is one contiguous draw and each one is identical to drawing it alone
+    offset = int(start) * stride
+    counter = np.array([offset % 2 ** 64, offset // 2 ** 64, 0, 0], dtype = np.uint64)
+    generator = np.random.Philox(key = key, counter = counter)
+
+    return generator.random_raw(int(count) * stride * 4).reshape(int(count), stride * 4)
+
+def uniforms(raw):
+
+    # 53-bit uniforms in the open interval (0, 1)
+    return ((raw >> np.uint64(11)).astype(np.float64) + 0.5) * 2.0 ** -53
+
+def box_muller(u1, u2, branch):
+
+    # Standard normals from pairs of uniforms, the cosine branch where branch is 0 and the sine branch where it is 1
+    radius = np.sqrt(-2 * np.log(u1))
+    angle = 2 * np.pi * u2 - 0.5 * np.pi * branch
+
+    return radius * np.cos(angle)
+
+# ----- Generate Realizations -----
+def generate_realizations(true_RNP, time, scenario, level, indices, sigma = 1.0, seed = 0, log = False):
+
+    # Step 1: Points of the scenario's regimes and the number of them that get noise in each regime
+    log_true = np.log(np.asarray(true_RNP, dtype = float))
+    n = len(log_true)
+    segments = regime_segments(time)
+    regimes = scenario_regimes(scenario)
+    counts = {regime: int(np.floor(level / 100 * (segments[regime][1] - segments[regime][0]) + 0.5)) for regime in regimes}
+    half = (n + 1) // 2
+    stride = -(-(n + 2 * half) // 4)
+
+    # Step 2: Raw words of every realization, drawn run by run for contiguous indices
+    indices = np.atleast_1d(np.asarray(indices, dtype = np.int64))
+    if np.any(indices < 0):
+        raise ValueError("Realization indices must be non-negative!")
+    key = stream_key(seed, scenario, level)
+    runs = np.split(np.arange(len(indices)), np.flatnonzero(np.diff(indices) != 1) + 1)
+    raw = np.empty((len(indices), stride * 4), dtype = np.uint64)
+    for run in runs:
+        if len(run):
+            raw[run] = raw_block(key, indices[run[0]], len(run), stride)
+
+    # Step 3: In each regime, the points with the smallest random keys get noise; point j takes the normal of
+    # Box-Muller pair j mod half, evaluated only at the selected points
+    base = log_true if log else np.exp(log_true)
+    noisy = np.broadcast_to(base, (len(indices), n)).copy()
+    flat_noisy = noisy.reshape(-1)
+    flat_raw = raw.reshape(-1)
+    rows = np.arange(len(indices))[:, None]
+    for regime in regimes:
+        start, stop = segments[regime]
+        count = counts[regime]
+        if count == 0:
+            continue
+        selected = start + np.argpartition(raw[:, start:stop], count - 1, axis = 1)[:, :count]
+        # Flat indices gather and scatter faster than pairs of row and column indices
+        pair = rows * (stride * 4) + n + selected % half
+        noise = sigma * box_muller(uniforms(flat_raw[pair]), uniforms(flat_raw[pair + half]), selected // half)
+
+        # Step 4: Additive white Gaussian noise in log space, a multiplicative factor on RNP that keeps it positive
+        target = rows * n + selected
+        flat_noisy[target] = flat_noisy[target] + noise if log else flat_noisy[target] * np.exp(noise)
+
+    return noisy
+
+def iter_realizations(true_RNP, time, scenario, level, count, batch_size = 4096, start = 0, sigma = 1.0, seed = 0, log = False):
+
+    # Batches of consecutive realizations, each batch one in-memory array
+    for batch_start in range(start, start + count, batch_size):
+        indices = np.arange(batch_start, min(batch_start + batch_size, start + count))
+        yield indices, generate_realizations(true_RNP, time, scenario, level, indices, sigma, seed, log)
+
+# ----- Main Execution -----
+def main():
+
+    # Generate realizations of every scenario and noise level of the paper and report the noise they carry
+    true_time, true_RNP = Data_Reader.read_columns("true_RNP.txt", skip_header = 1)[:2] # days, psia2/cp-d/Mscf
+    scenarios = ("All", "BDF", "Transient", "Transient-BDF", "Transient-Transition", "Transition", "Transition-BDF")
+    segments = regime_segments(true_time)
+    log_true = np.log(true_RNP)
+    for scenario in scenarios:
+        for level in (25, 50, 75):
+            fractions = np.zeros(len(segments))
+            realizations = 0
+            for indices, log_RNP in iter_realizations(true_RNP, true_time, scenario, level, 10000, log = True):
+                noised = log_RNP != log_true
+                fractions += [noised[:, start:stop].mean(axis = 1).sum() for start, stop in segments.values()]
+                realizations += len(indices)
+            print(f"{scenario}\t{level}%\t" + "\t".join(f"{regime}={fraction:.3f}" for regime, fraction in zip(segments, fractions / realizations)))
+
+if __name__ == "__main__":
+    main()
@@ -7,75 +7,33 @@ Created on Friday, 23 June 2023
 """
 
 import os
+import hashlib
 import numpy as np
-import matplotlib.pyplot as plt
+import Data_Reader
 from scipy import integrate
-from scipy.interpolate import interp1d
+from scipy.interpolate import interp1d, PchipInterpolator
 
 # ----- Import PVT Data -----
 def read_gas_properties (file_path):
 
-    # Step 1: Open the text file
-    with open(file_path, "r", encoding = "utf-8") as file:
-        
-        # Step 2: Read the file contents
-        lines = file.readlines()
-
-    # Step 3: Process data and create arrays
-    pvt_pressure = []
-    pvt_Z = []
-    pvt_mug = []
-    pvt_cg = []
-    
-    # Step 4: Process each subsequent line and append the values
-    for line in lines[2:]:
-        values = line.split()
-        pvt_pressure.append(float(values[0]))
-        pvt_Z.append(float(values[1]))
-        pvt_mug.append(float(values[2]))
-        pvt_cg.append(float(values[3]))
+    # Parse the PVT columns below the two header lines
+    pvt_pressure, pvt_Z, pvt_mug, pvt_cg = Data_Reader.read_columns(file_path, skip_header = 2, min_columns = 4)[:4]
     
     return pvt_pressure, pvt_Z, pvt_mug, pvt_cg
 
 # ----- Import Bottomhole Pressure Data -----
 def read_production (file_path):
 
-    # Step 1: Open the text file
-    with open(file_path, "r", encoding = "utf-8") as file:
-    
-        # Step 2: Read the file contents
-        lines = file.readlines()
-
-    # Step 3: Process the data and create an array
-    time = []
-    bhp = []
-    
-    # Process each subsequent line and append the values
-    for line in lines[2:]:
-        values = line.split()
-        if len(values) >= 2:
-            time.append(float(values[0]))
-            bhp.append(float(values[1]))
+    # Parse the two data columns below the two header lines
+    time, bhp = Data_Reader.read_columns(file_path, skip_header = 2)[:2]
     
     return time, bhp
 
 # ----- Import Reservoir Pressure Data -----
 def read_reservoir (file_path):
 
-    # Step 1: Open the text file
-    with open(file_path, "r", encoding = "utf-8") as file:
-    
-        # Step 2: Read the file contents
-        lines = file.readlines()
-
-    # Step 3: Process the data and create an array
-    res_pressure = []
-    
-    # Process each subsequent line and append the values
-    for line in lines[2:]:
-        values = line.split()
-        if len(values) >= 2:
-            res_pressure.append(float(values[1]))
+    # Parse the reservoir pressure column below the two header lines
+    res_pressure = Data_Reader.read_columns(file_path, skip_header = 2)[1]
     
     return res_pressure
 
@@ -90,57 +48,364 @@ def interpolate_data (ref_point, ref_values, target_point):
 
     return interpolated_point
 
-# ----- Pseudopressure Calculation -----
-def calculate_pseudopressure(pressure, mug, Z):
+# ----- Pseudopressure Integration -----
+def integrate_pseudopressure(pressure, mug, Z, method = "trapezoid"):
+
+    # Step 1: Sort the PVT table by pressure and evaluate the integrand 2p/(mu*Z)
+    pressure = np.asarray(pressure, dtype = float)
+    order = np.argsort(pressure, kind = "stable")
+    p = pressure[order]
+    integrand = 2 * p / (np.asarray(mug, dtype = float)[order] * np.asarray(Z, dtype = float)[order])
+
+    # Step 2: Integrate from zero to the first PVT pressure with mu and Z held at the first row
+    # (the integrand is then linear in p, so the trapezoid is exact)
+    base = 0.5 * integrand[0] * p[0]
+
+    # Step 3: Integrate cumulatively over the whole table in a single pass, with the selected rule only
+    trapezoid = integrate.cumulative_trapezoid(integrand, p, initial = 0)
+    if method == "simpson":
+        result = integrate.cumulative_simpson(integrand, x = p, initial = 0)
+        reference = trapezoid
+    elif method in ("trapezoid", "spline"):
+        result = trapezoid if method == "trapezoid" else PchipInterpolator(p, integrand).antiderivative()(p)
+        # Trapezoid with the Euler-Maclaurin end correction -h^2/12 (f'(b) - f'(a)) on every interval, a higher-order rule in one pass
+        derivative = np.gradient(integrand, p)
+        reference = trapezoid - np.concatenate(([0], np.cumsum(np.diff(p) ** 2 / 12 * np.diff(derivative))))
+    else:
+        raise ValueError(f"Unknown integration method: {method}")
+
+    # Step 4: Estimate the error from the disagreement with a rule of different order
+    pseudopressure = np.empty_like(p)
+    pseudopressure[order] = base + result
+    error = np.empty_like(p)
+    error[order] = np.abs(result - reference)
+
+    return pseudopressure, error
 
-    pseudopressure = []
+# ----- Pseudopressure Calculation -----
+def calculate_pseudopressure(pressure, mug, Z, method = "trapezoid"):
 
-    for p, mu, z in zip(pressure, mug, Z):
-        def integrand(p_val):
-            return p_val / (mu * z)
-        
-        result, _ = integrate.quad(integrand, 0, p)
-        pseudopressure.append(2 * result)
+    pseudopressure, _ = integrate_pseudopressure(pressure, mug, Z, method)
     
     return pseudopressure
 
 # ----- Pseudotime Calculation -----
 def calculate_pseudotime(time, res_pressure, pvt_pressure, pvt_mug, ct):
 
+    # Step 1: Evaluate gas viscosity and total compressibility over the reservoir pressure history
+    time = np.asarray(time, dtype = float)
+    res_pressure = np.asarray(res_pressure, dtype = float)
+
     mug_i = interpolate_data(pvt_pressure, pvt_mug, res_pressure[0])
     ct_i = interpolate_data(pvt_pressure, ct, res_pressure[0])
 
     mug_res = interpolate_data(pvt_pressure, pvt_mug, res_pressure)
     ct_res = interpolate_data(pvt_pressure, ct, res_pressure)
 
-    pseudotime = []
+    # Step 2: Integrate 1/(mu*ct) cumulatively along the history in a single pass
+    integrand = 1 / (mug_res * ct_res)
+    pseudotime = integrate.cumulative_trapezoid(integrand, time, initial = 0)
 
-    for t, mu, c in zip(time, mug_res, ct_res):
-        def integrand(t_val):
-            return 1 / (mu * c)
-        
-        result, _ = integrate.quad(integrand, 0, t)
-        pseudotime.append(mug_i * ct_i * result)
+    # Step 3: Add the interval from zero to the first sample and normalize to initial conditions
+    pseudotime += integrand[0] * time[0]
+    pseudotime *= mug_i * ct_i
 
     return pseudotime
 
-# ----- Main Code -----
-def main():
+# ----- PVT Table -----
+class PVTTable:
+    """
+    PVT table with a preprocessed pressure axis for batched property lookups.
+
+    The table is sorted and the per-interval slopes of mu, Z, cg, ct and m(p)
+    are computed once. A lookup then locates every requested pressure in one
+    pass (arithmetically on a uniform axis, by searchsorted otherwise) and
+    interpolates all five properties together, working in fixed-size chunks
+    through scratch buffers owned by the table. Passing out reuses a caller
+    buffer of shape (5,) + pressure.shape, so repeated conversions of long
+    series allocate nothing per call. from_arrays rebuilds a table on the
+    arrays of another one, e.g. in shared memory, without copying them.
+    """
+
+    properties = ("mug", "Z", "cg", "ct", "pseudopressure")
+
+    def __init__(self, pvt_pressure, pvt_Z, pvt_mug, pvt_cg, cf = 3e-6, pvt_pseudopressure = None,
+                 method = "trapezoid", chunk_size = 65536):
+
+        # Step 1: Sort the pressure axis once
+        pressure = np.asarray(pvt_pressure, dtype = float)
+        order = np.argsort(pressure, kind = "stable")
+        self.pressure = np.ascontiguousarray(pressure[order]) # psia
+        if len(self.pressure) < 2:
+            raise ValueError("PVT table needs at least two pressures!")
+        if not np.all(np.diff(self.pressure) > 0):
+            raise ValueError("Pressures of the PVT table must be strictly increasing, without repeats or NaN!")
+
+        # Step 2: Stack the properties, integrating m(p) when it is not supplied
+        pvt_Z = np.asarray(pvt_Z, dtype = float)
+        pvt_mug = np.asarray(pvt_mug, dtype = float)
+        pvt_cg = np.asarray(pvt_cg, dtype = float)
+        if pvt_pseudopressure is None:
+            pvt_pseudopressure = calculate_pseudopressure(pressure, pvt_mug, pvt_Z, method)
+        self.cf = cf # 1/psi
+        self.values = np.ascontiguousarray(np.vstack((pvt_mug, pvt_Z, pvt_cg, cf + pvt_cg, np.asarray(pvt_pseudopressure, dtype = float)))[:, order])
+
+        # Step 3: Precompute the slope of every property on every interval
+        self.slopes = np.ascontiguousarray(np.diff(self.values, axis = 1) / np.diff(self.pressure))
+        self._prepare(chunk_size)
+
+    @classmethod
+    def from_arrays(cls, pressure, values, slopes, cf = 3e-6, chunk_size = 65536):
+
+        # Rebuild a table from the sorted axis, properties and slopes of another one without copying them,
+        # e.g. from views of shared memory; only the small scratch buffers are private
+        table = cls.__new__(cls)
+        table.pressure = pressure # psia
+        table.values = values
+        table.slopes = slopes
+        table.cf = cf # 1/psi
+        table._prepare(chunk_size)
+
+        return table
+
+    def _prepare(self, chunk_size):
+
+        # Step 4: Detect a uniformly spaced axis, which is located without a search
+        steps = np.diff(self.pressure)
+        self.step = steps.mean()
+        self.uniform = bool(np.allclose(steps, self.step, rtol = 1e-9, atol = 0))
+
+        # Step 5: Allocate the scratch buffers reused by every lookup
+        self.chunk_size = chunk_size
+        self._index = np.empty(chunk_size, dtype = np.intp)
+        self._offset = np.empty(chunk_size, dtype = float)
+        self._scratch = np.empty(chunk_size, dtype = float)
+
+    def _locate(self, pressure, count):
+
+        index = self._index[:count]
+        offset = self._offset[:count]
+
+        # Step 1: Find the interval holding each pressure
+        if self.uniform:
+            np.subtract(pressure, self.pressure[0], out = offset)
+            np.floor_divide(offset, self.step, out = offset)
+            index[:] = offset
+        else:
+            index[:] = np.searchsorted(self.pressure, pressure, side = "right")
+            index -= 1
+        np.clip(index, 0, len(self.pressure) - 2, out = index)
+
+        # Step 2: Distance from the left end of the interval
+        np.take(self.pressure, index, out = offset)
+        np.subtract(pressure, offset, out = offset)
+
+        return index, offset
+
+    def lookup(self, pressure, out = None, properties = None):
+
+        # Step 1: Check the pressures and the output buffer
+        pressure = np.asarray(pressure, dtype = float)
+        rows = range(len(self.properties)) if properties is None else [self.properties.index(name) for name in properties]
+        shape = (len(rows),) + pressure.shape
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape or out.dtype != np.float64 or not out.flags.c_contiguous:
+            raise ValueError(f"Output buffer must be a C-contiguous float64 array of shape {shape}!")
+
+        flat_pressure = pressure.reshape(-1)
+        flat_out = out.reshape(len(rows), -1)
+        if flat_pressure.size and (flat_pressure.min() < self.pressure[0] or flat_pressure.max() > self.pressure[-1]):
+            raise ValueError("Pressure is outside the range of the PVT table!")
+
+        # Step 2: Interpolate every requested property chunk by chunk
+        for start in range(0, flat_pressure.size, self.chunk_size):
+            stop = min(start + self.chunk_size, flat_pressure.size)
+            count = stop - start
+            index, offset = self._locate(flat_pressure[start:stop], count)
+            scratch = self._scratch[:count]
+            for i, row in enumerate(rows):
+                target = flat_out[i, start:stop]
+                np.take(self.values[row], index, out = target)
+                np.take(self.slopes[row], index, out = scratch)
+                scratch *= offset
+                target += scratch
+
+        return out
+
+    def mug(self, pressure, out = None):
+        return self.lookup(pressure, None if out is None else out.reshape((1,) + out.shape), ("mug",))[0]
+
+    def Z(self, pressure, out = None):
+        return self.lookup(pressure, None if out is None else out.reshape((1,) + out.shape), ("Z",))[0]
+
+    def cg(self, pressure, out = None):
+        return self.lookup(pressure, None if out is None else out.reshape((1,) + out.shape), ("cg",))[0]
+
+    def ct(self, pressure, out = None):
+        return self.lookup(pressure, None if out is None else out.reshape((1,) + out.shape), ("ct",))[0]
+
+    def pseudopressure(self, pressure, out = None):
+        return self.lookup(pressure, None if out is None else out.reshape((1,) + out.shape), ("pseudopressure",))[0]
+
+# ----- Default Input Files -----
+gas_properties_file_path = r"C:\Users\ASUS\Documents\Kuliah\2. Master's Texas A&M University\Publications\Conference Paper\Outlier Detection Paper\Outlier Detection Simulator\Synthetic Model\gas_properties.txt"
+bhp_file_path = r"C:\Users\ASUS\Documents\Kuliah\2. Master's Texas A&M University\Publications\Conference Paper\Outlier Detection Paper\Outlier Detection Simulator\Synthetic Model\bhp.txt"
+reservoir_file_path = r"C:\Users\ASUS\Documents\Kuliah\2. Master's Texas A&M University\Publications\Conference Paper\Outlier Detection Paper\Outlier Detection Simulator\Synthetic Model\res_pressure.txt"
+
+# Version of the cached outputs; bump it when the conversion changes so old cache files are not served
+cache_version = 2
+
+# ----- Pseudopressure Conversion -----
+class PseudopressureConversion:
+    """
+    Pseudopressure and pseudotime conversion of one well.
+
+    Nothing is computed when the object is built. The outputs are evaluated
+    on first access and memoized on disk in cache_folder under a hash of the
+    inputs, so repeated runs on the same data skip the recomputation.
+    """
+
+    outputs = ("pvt_pseudopressure", "pvt_pseudopressure_error", "ct", "cti", "pseudotime",
+               "res_pressure_pseudopressure", "bhp_pseudopressure", "delta_pseudopressure")
+
+    def __init__(self, pvt_pressure, pvt_Z, pvt_mug, pvt_cg, time, bhp, res_pressure,
+                 cf = 3e-6, method = "trapezoid", cache_folder = os.path.join("Pseudopressure Conversion", "cache")):
+
+        self.pvt_pressure = np.asarray(pvt_pressure, dtype = float) # psia
+        self.pvt_Z = np.asarray(pvt_Z, dtype = float)
+        self.pvt_mug = np.asarray(pvt_mug, dtype = float) # cp
+        self.pvt_cg = np.asarray(pvt_cg, dtype = float) # 1/psi
+        self.time = np.asarray(time, dtype = float) # days
+        self.bhp = np.asarray(bhp, dtype = float) # psia
+        self.res_pressure = np.asarray(res_pressure, dtype = float) # psia
+        self.cf = cf # 1/psi
+        self.method = method
+        self.cache_folder = cache_folder
+        self._results = None
+        self._pvt_table = None
+
+    @classmethod
+    def from_files(cls, gas_properties_file_path = gas_properties_file_path, bhp_file_path = bhp_file_path,
+                   reservoir_file_path = reservoir_file_path, **kwargs):
+
+        pvt_pressure, pvt_Z, pvt_mug, pvt_cg = read_gas_properties(gas_properties_file_path) # psia, , cp, 1/psi
+        time, bhp = read_production(bhp_file_path) # hrs., psia
+        time = np.array(time) / 24 # days
+        res_pressure = read_reservoir(reservoir_file_path) # psia
+
+        return cls(pvt_pressure, pvt_Z, pvt_mug, pvt_cg, time, bhp, res_pressure, **kwargs)
+
+    @property
+    def key(self):
+
+        digest = hashlib.sha256(f"v{cache_version}|".encode("utf-8"))
+        for values in (self.pvt_pressure, self.pvt_Z, self.pvt_mug, self.pvt_cg, self.time, self.bhp, self.res_pressure):
+            digest.update(np.ascontiguousarray(values).tobytes())
+            digest.update(b"|")
+        digest.update(f"{self.cf!r}|{self.method}".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def _compute(self):
+
+        # Step 1: Integrate pseudopressure over the PVT table
+        pvt_pseudopressure, pvt_pseudopressure_error = integrate_pseudopressure(self.pvt_pressure, self.pvt_mug, self.pvt_Z, self.method)
+        table = PVTTable(self.pvt_pressure, self.pvt_Z, self.pvt_mug, self.pvt_cg, self.cf, pvt_pseudopressure)
+
+        # Step 2: Integrate pseudotime over the reservoir pressure history
+        ct = self.cf + self.pvt_cg
+        pseudotime = calculate_pseudotime(self.time, self.res_pressure, self.pvt_pressure, self.pvt_mug, ct)
+        cti = table.ct(self.res_pressure[0])
+
+        # Step 3: Convert reservoir and bottomhole pressures to pseudopressure
+        bhp_pseudopressure = table.pseudopressure(self.bhp)
+        res_pressure_pseudopressure = np.full(len(pseudotime), table.pseudopressure(self.res_pressure[0]))
+        delta_pseudopressure = res_pressure_pseudopressure - bhp_pseudopressure
+
+        return {
+            "pvt_pseudopressure": pvt_pseudopressure,
+            "pvt_pseudopressure_error": pvt_pseudopressure_error,
+            "ct": ct,
+            "cti": np.asarray(cti),
+            "pseudotime": pseudotime,
+            "res_pressure_pseudopressure": res_pressure_pseudopressure,
+            "bhp_pseudopressure": bhp_pseudopressure,
+            "delta_pseudopressure": delta_pseudopressure
+        }
+
+    def _evaluate(self, name):
+
+        if self._results is None:
+            cache_path = None
+            if self.cache_folder is not None:
+                cache_path = os.path.join(self.cache_folder, f"{self.key}.npz")
+
+            # Step 1: Reuse the memoized results of an earlier run on the same inputs
+            if cache_path is not None and os.path.exists(cache_path):
+                with np.load(cache_path) as cached:
+                    self._results = {output: cached[output] for output in self.outputs}
+
+            # Step 2: Otherwise compute them and write the cache atomically
+            else:
+                self._results = self._compute()
+                if cache_path is not None:
+                    os.makedirs(self.cache_folder, exist_ok = True)
+                    temporary_path = f"{cache_path}.{os.getpid()}.tmp.npz"
+                    np.savez(temporary_path, **self._results)
+                    os.replace(temporary_path, cache_path)
+
+        return self._results[name]
+
+    @property
+    def pvt_table(self):
+
+        if self._pvt_table is None:
+            self._pvt_table = PVTTable(self.pvt_pressure, self.pvt_Z, self.pvt_mug, self.pvt_cg, self.cf, self.pvt_pseudopressure)
+
+        return self._pvt_table
+
+    @property
+    def pvt_pseudopressure(self):
+        return self._evaluate("pvt_pseudopressure")
+
+    @property
+    def pvt_pseudopressure_error(self):
+        return self._evaluate("pvt_pseudopressure_error")
+
+    @property
+    def ct(self):
+        return self._evaluate("ct")
+
+    @property
+    def cti(self):
+        return float(self._evaluate("cti"))
+
+    @property
+    def pseudotime(self):
+        return self._evaluate("pseudotime")
 
-    gas_properties_file_path = r"C:\Users\ASUS\Documents\Kuliah\2. Master's Texas A&M University\Publications\Conference Paper\Outlier Detection Paper\Outlier Detection Simulator\Synthetic Model\gas_properties.txt"
-    pvt_pressure, pvt_Z, pvt_mug, pvt_cg = read_gas_properties(gas_properties_file_path) # psia, , cp, 1/psi
+    @property
+    def res_pressure_pseudopressure(self):
+        return self._evaluate("res_pressure_pseudopressure")
 
-    downhole_file_path = r"C:\Users\ASUS\Documents\Kuliah\2. Master's Texas A&M University\Publications\Conference Paper\Outlier Detection Paper\Outlier Detection Simulator\Synthetic Model\downhole_gas_rate.txt"
-    time, downhole_rate = read_production(downhole_file_path) # hrs., Mcf/d
+    @property
+    def bhp_pseudopressure(self):
+        return self._evaluate("bhp_pseudopressure")
 
-    bhp_file_path = r"C:\Users\ASUS\Documents\Kuliah\2. Master's Texas A&M University\Publications\Conference Paper\Outlier Detection Paper\Outlier Detection Simulator\Synthetic Model\bhp.txt"
-    time, bhp = read_production(bhp_file_path) # hrs., psia
-    time = np.array(time) / 24 # days
-    
-    reservoir_file_path = r"C:\Users\ASUS\Documents\Kuliah\2. Master's Texas A&M University\Publications\Conference Paper\Outlier Detection Paper\Outlier Detection Simulator\Synthetic Model\res_pressure.txt"
-    res_pressure = read_reservoir(reservoir_file_path) # psia
-    
-    pvt_pseudopressure = calculate_pseudopressure(pvt_pressure, pvt_mug, pvt_Z)
+    @property
+    def delta_pseudopressure(self):
+        return self._evaluate("delta_pseudopressure")
+
+# ----- Main Code -----
+def main():
+
+    conversion = PseudopressureConversion.from_files()
+    time = conversion.time
+    res_pressure = conversion.res_pressure
+    bhp = conversion.bhp
+    pvt_pressure = conversion.pvt_pressure
+    pvt_pseudopressure = conversion.pvt_pseudopressure
     
     # Plot pseudopressure vs pressure
     #plt.figure()
@@ -155,25 +420,9 @@ def main():
     #plt.xlim(left=0)
     #plt.show()
 
-    global cti, pseudotime
-    cf = 3e-6 # 1/psi
-    ct = [cf + pvt_cg[i] for i in range(len(pvt_cg))]
-    pseudotime = calculate_pseudotime(time, res_pressure, pvt_pressure, pvt_mug, ct)
-    
-    res_pressure_init = res_pressure[0]
-    cti = interpolate_data(pvt_pressure, ct, res_pressure_init)
-
-    bhp_pseudopressure = interpolate_data(pvt_pressure, pvt_pseudopressure, bhp)
-    bhp_pseudopressure = np.array(bhp_pseudopressure)
-
-    res_pressure_pseudopressure  = []
-    for i in range (len(pseudotime)):
-        res_pressure_pseudopressure.append(interpolate_data(pvt_pressure, pvt_pseudopressure, res_pressure_init))
-    res_pressure_pseudopressure = np.array(res_pressure_pseudopressure)
-    
-    global delta_pseudopressure
-    delta_pseudopressure = [res_pp - bhp_pp for res_pp, bhp_pp in zip(res_pressure_pseudopressure, bhp_pseudopressure)]
-    delta_pseudopressure = np.array(delta_pseudopressure)
+    res_pressure_pseudopressure = conversion.res_pressure_pseudopressure
+    bhp_pseudopressure = conversion.bhp_pseudopressure
+    delta_pseudopressure = conversion.delta_pseudopressure
 
     # Plot delta pseudopressure vs time
     #plt.figure()
@@ -203,4 +452,5 @@ def main():
 
     return
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
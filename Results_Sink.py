@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Append-Only Results Sink
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import time
+
+# ----- Write Table Atomically -----
+def write_table(file_path, header, rows):
+
+    # Step 1: Write the whole table next to the target
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "w") as file:
+            # Write the header
+            file.write("\t".join(header) + "\n")
+
+            # Write the data to the file
+            file.write("".join("\t".join(str(value) for value in row) + "\n" for row in rows))
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Step 2: Swap it in so that readers never see a partial table
+        os.replace(temporary_path, file_path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+# ----- Results Sink -----
+class ResultsSink:
+    """Tab-separated journal that appends one record per finished data set."""
+
+    def __init__(self, journal_path, columns, buffer_size = 256, flush_interval = 2.0):
+
+        # Records are buffered up to buffer_size of them, but never for longer than flush_interval seconds
+        self.journal_path = journal_path
+        self.columns = tuple(columns)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+        # Step 1: Drop a trailing line left truncated by an interrupted run
+        folder = os.path.dirname(journal_path)
+        if folder:
+            os.makedirs(folder, exist_ok = True)
+        new_journal = not os.path.exists(journal_path) or os.path.getsize(journal_path) == 0
+        if not new_journal:
+            with open(journal_path, "rb+") as file:
+                file.seek(0, os.SEEK_END)
+                end = file.tell()
+                position = end
+                while position > 0:
+                    step = min(65536, position)
+                    file.seek(position - step)
+                    newline = file.read(step).rfind(b"\n")
+                    if newline >= 0:
+                        position = position - step + newline + 1
+                        break
+                    position -= step
+                if position < end:
+                    file.truncate(position)
+                    file.flush()
+                    os.fsync(file.fileno())
+            new_journal = position == 0
+
+        # Step 2: Open for appending and start a new journal with its header
+        self._file = open(journal_path, "a")
+        if new_journal:
+            self._buffer.append("\t".join(self.columns) + "\n")
+            self.flush()
+
+    def append(self, record):
+
+        if len(record) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values per record!")
+        self._buffer.append("\t".join(str(value) for value in record) + "\n")
+        if len(self._buffer) >= self.buffer_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def extend(self, records):
+
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+
+        # Whole lines only, so a crash can at most cut the last line of one flush
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def records(self):
+
+        # Read back every complete record of the journal as strings
+        self.flush()
+        with open(self.journal_path, "r") as file:
+            lines = file.read().splitlines()
+        return [tuple(line.split("\t")) for line in lines[1:] if line.count("\t") == len(self.columns) - 1]
+
+    def close(self):
+
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Slope Interval Search
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+
+# Fields of every interval returned by the search; end is inclusive
+interval_fields = ("start", "end", "slope", "intercept", "r_value")
+
+# ----- Prefix Moments -----
+def prefix_moments(x, y):
+
+    # Step 1: Center both axes so that the window sums do not cancel catastrophically
+    x = np.asarray(x, dtype = float)
+    y = np.asarray(y, dtype = float)
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("Dimensions of x and y not match!")
+    x_mean, y_mean = x.mean(), y.mean()
+    x = x - x_mean
+    y = y - y_mean
+
+    # Step 2: Prefix sums of x, y, x^2, y^2 and xy with a leading zero
+    moments = np.zeros((5, len(x) + 1))
+    np.cumsum(np.stack((x, y, x * x, y * y, x * y)), axis = 1, out = moments[:, 1:])
+
+    return moments, x_mean, y_mean
+
+# ----- Window Regression -----
+def window_regression(moments, x_mean, y_mean, start, length):
+
+    # Step 1: Window sums in O(1) each from the prefix sums
+    sx, sy, sxx, syy, sxy = moments[:, start + length] - moments[:, start]
+
+    # Step 2: Least-squares slope, intercept and correlation of every window
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        sxx_centered = length * sxx - sx * sx
+        sxy_centered = length * sxy - sx * sy
+        syy_centered = length * syy - sy * sy
+        slope = sxy_centered / sxx_centered
+        intercept = (sy + length * y_mean) / length - slope * (sx + length * x_mean) / length
+        r_value = sxy_centered / np.sqrt(sxx_centered * syy_centered)
+
+    return slope, intercept, r_value
+
+# ----- Search Slope Intervals -----
+def search_slope_intervals(x, y, log = True, desired_slope = 0.5, slope_tolerance = 0.01, r_threshold = 0.7,
+                           min_length = 2, max_length = None, rank = "length", max_intervals = None, chunk_size = 262144):
+
+    # Step 1: Regress in log-log space by default and build the prefix sums once
+    x = np.asarray(x, dtype = float)
+    y = np.asarray(y, dtype = float)
+    if log:
+        x = np.log(x)
+        y = np.log(y)
+    moments, x_mean, y_mean = prefix_moments(x, y)
+    n = len(x)
+    max_length = n if max_length is None else min(max_length, n)
+    if min_length < 2:
+        raise ValueError("Intervals need at least 2 points!")
+
+    # Step 2: Evaluate blocks of window sizes at once, every start of each size, and keep those that pass
+    found = {field: [] for field in interval_fields}
+    block_size = max(1, chunk_size // max(n, 1))
+    for first_length in range(min_length, max_length + 1, block_size):
+        length = np.arange(first_length, min(first_length + block_size, max_length + 1))[:, None]
+        start = np.arange(n - first_length + 1)[None, :]
+        valid = start + length <= n
+        slope, intercept, r_value = window_regression(moments, x_mean, y_mean, np.where(valid, start, 0), length)
+        keep = valid & (np.abs(slope - desired_slope) < slope_tolerance) & (r_value > r_threshold)
+        if keep.any():
+            row, column = np.nonzero(keep)
+            for field, values in zip(interval_fields, (column, column + length[row, 0] - 1, slope[keep], intercept[keep], r_value[keep])):
+                found[field].append(values)
+
+    intervals = {field: np.concatenate(values) if values else np.empty(0, dtype = int if field in ("start", "end") else float)
+                 for field, values in found.items()}
+
+    # Step 3: Rank the intervals: longest, best correlated or closest to the desired slope first
+    length = intervals["end"] - intervals["start"] + 1
+    slope_error = np.abs(intervals["slope"] - desired_slope)
+    if rank == "length":
+        order = np.lexsort((slope_error, -intervals["r_value"], -length))
+    elif rank == "r_value":
+        order = np.lexsort((slope_error, -length, -intervals["r_value"]))
+    elif rank == "slope":
+        order = np.lexsort((-intervals["r_value"], -length, slope_error))
+    else:
+        raise ValueError(f"Unknown interval ranking: {rank}")
+    order = order[:max_intervals]
+
+    return {field: values[order] for field, values in intervals.items()}
+
+# ----- Best Interval -----
+def best_interval(x, y, **options):
+
+    intervals = search_slope_intervals(x, y, max_intervals = 1, **options)
+    if not len(intervals["start"]):
+        return None
+
+    return {field: values[0].item() for field, values in intervals.items()}
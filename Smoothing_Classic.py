@@ -7,47 +7,25 @@ Created on Friday, 15 September 2023
 """
 
 import numpy as np
+import Data_Reader
+import Moving_Average
 import matplotlib.pyplot as plt
 import Pseudopressure_Conversion
-from scipy import stats
+import Smoothing_Regression
 
 # ----- Import Production Data -----
 def read_production(file_path):
 
-    # Step 1: Open the text file
-    with open(file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    time = []
-    downhole_rate = []
-    
-    # Process each subsequent line and append the values
-    for line in lines[2:]:
-        values = line.split()
-        if len(values) >= 2:
-            time.append(float(values[0]))
-            downhole_rate.append(float(values[1]))
+    # Parse the two data columns below the two header lines
+    time, downhole_rate = Data_Reader.read_columns(file_path, skip_header = 2)[:2]
     
     return time, downhole_rate
 
 # ----- Import Noisy RNP Data -----
 def read_noisy_RNP (file_path):
 
-    # Step 1: Open the text file
-    with open (file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    noisy_time = []
-    noisy_RNP = []
-    
-    # Step 3: Process each subsequent line and append the values
-    for line in lines[1:]:
-        values = line.split()
-        if len(values) >= 2:
-            noisy_time.append(float(values[0]))
-            noisy_RNP.append(float(values[1]))
+    # Parse the two data columns below the header line
+    noisy_time, noisy_RNP = Data_Reader.read_columns(file_path, skip_header = 1)[:2]
     
     return noisy_time, noisy_RNP
 
@@ -68,7 +46,8 @@ def main():
     tmb = [volume[i] / surface_rate[i] for i in range (1, len(time))] # days
 
     # Generate RNP coordinates
-    RNP_data = [Pseudopressure_Conversion.delta_pseudopressure[i] / downhole_rate[i] for i in range(1, len(time))]
+    conversion = Pseudopressure_Conversion.PseudopressureConversion.from_files()
+    RNP_data = [conversion.delta_pseudopressure[i] / downhole_rate[i] for i in range(1, len(time))]
     RNP_coordinates = np.column_stack((time_prod, RNP_data))
     print(RNP_data[0])
 
@@ -90,29 +69,18 @@ def main():
     log_noisy_time = np.log(noisy_time)
     log_noisy_RNP = np.log(noisy_RNP)
 
-    # Perform Linear Regression
-    slope, intercept, r_value, p_value, std_err = stats.linregress(log_noisy_time, log_noisy_RNP)
-    regression_RNP = [slope * log_noisy_time[i] + intercept for i in range(len(log_noisy_time))]
-
-    # Perform Polynomial Regression
+    # Perform Linear and Polynomial Regression from one factorization of the design matrix
     degree1 = 3
-    coefficients1 = np.polyfit(log_noisy_time, log_noisy_RNP, degree1)
-    polynomial_function1 = np.poly1d(coefficients1)
-    x_poly1 = np.linspace(min(log_noisy_time), max(log_noisy_time), 100)
-    y_poly1 = polynomial_function1(x_poly1)
-
     degree2 = 10
-    coefficients2 = np.polyfit(log_noisy_time, log_noisy_RNP, degree2)
-    polynomial_function2 = np.poly1d(coefficients2)
-    x_poly2 = np.linspace(min(log_noisy_time), max(log_noisy_time), 100)
-    y_poly2 = polynomial_function2(x_poly2)
+    x_poly1 = Smoothing_Regression.plot_grid(log_noisy_time, 100)
+    fitted_RNP, plotted_RNP = Smoothing_Regression.polynomial_regression(log_noisy_RNP, log_noisy_time, degrees = (1, degree1, degree2), x_plot = x_poly1)
+    regression_RNP = fitted_RNP[1]
+    y_poly1 = plotted_RNP[degree1]
 
-    # Perform Moving Average
+    # Perform Moving Average over trailing windows, aligned with noisy time (NaN until a window is full)
     window_size1 = 5
-    moving_average1 = np.convolve(noisy_RNP, np.ones(window_size1) / window_size1, mode = 'valid')
-    
     window_size2 = 20
-    moving_average2 = np.convolve(noisy_RNP, np.ones(window_size2) / window_size2, mode = 'valid')
+    moving_average1, moving_average2 = Moving_Average.moving_average(noisy_RNP, (window_size1, window_size2), alignment = "trailing", edge = "nan")
 
     # Plot noisy RNP vs time
     plt.figure()
@@ -122,8 +90,8 @@ def main():
     plt.plot(noisy_time, np.exp(regression_RNP), '-.', label = 'linear regression', linewidth = '3', alpha = 0.85)
     plt.plot(np.exp(x_poly1), np.exp(y_poly1), '--', label = 'polynomial regression (degree = 3)', linewidth = '3', alpha = 0.8)
     #plt.plot(np.exp(x_poly2), np.exp(y_poly2), '--', label = 'polynomial regression (degree = 10)', linewidth = '3', alpha = 0.8)
-    plt.plot(noisy_time[window_size1-1:], moving_average1, '-', label = 'moving average (window = 5)', linewidth = '3', alpha = 0.75)
-    #plt.plot(noisy_time[window_size2-1:], moving_average2, '-', label = 'moving average (window = 20)', linewidth = '3', alpha = 0.75)
+    plt.plot(noisy_time, moving_average1, '-', label = 'moving average (window = 5)', linewidth = '3', alpha = 0.75)
+    #plt.plot(noisy_time, moving_average2, '-', label = 'moving average (window = 20)', linewidth = '3', alpha = 0.75)
     plt.xlabel("t, days", fontsize = 20)
     plt.ylabel("$\Delta$m(p)/$q_{g}$, $psia^{2}$/cp$\cdot$d/Mscf", fontsize = 20)
     plt.xscale("log")
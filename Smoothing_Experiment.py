@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Smoothing Experiment Runner
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import Data_Reader
+import Dataset_Store
+import Experiment_Checkpoint
+import Results_Sink
+import Smoothing_Lowess
+import Smoothing_Metrics
+import Smoothing_Operators
+import Smoothing_PSpline
+import Smoothing_SavGol
+
+# ----- Smoothing Methods -----
+def smooth_gaussian_kernel(log_time, log_RNP, sigma = 5):
+
+    operator = Smoothing_Operators.smoothing_operator("gaussian_kernel", log_time, sigma = sigma)
+
+    return Smoothing_Operators.apply_operator(operator, log_RNP)
+
+def smooth_moving_average(log_time, log_RNP, window = 5):
+
+    operator = Smoothing_Operators.smoothing_operator("moving_average", log_time, window = window)
+
+    return Smoothing_Operators.apply_operator(operator, log_RNP)
+
+def smooth_lowess(log_time, log_RNP, span = 5, robust = False, axis = "index"):
+
+    # MATLAB smooth(logRNP, span, "lowess") fits on the sample index; axis = "log_time" fits on log(t)
+    return Smoothing_Lowess.lowess(log_RNP, span, x = None if axis == "index" else log_time, robust = robust)
+
+def smooth_savgol(log_time, log_RNP, window = 5, order = 2, axis = "index"):
+
+    # MATLAB smooth(logRNP, window, "sgolay", order) fits on the sample index; axis = "log_time" fits on log(t)
+    return Smoothing_SavGol.savgol(log_RNP, window, order, x = None if axis == "index" else log_time)
+
+def smooth_gam(log_time, log_RNP, n_splines = 20, lam = 0.6):
+
+    # Linear GAM with pygam's defaults: 20 cubic P-splines on log(t) with a fixed penalty
+    return Smoothing_PSpline.pspline(log_RNP, log_time, lam = lam, n_splines = n_splines)
+
+def smooth_b_spline(log_time, log_RNP, n_splines = 100):
+
+    # Penalty of every data set picked by GCV over pygam's gridsearch grid
+    return Smoothing_PSpline.pspline(log_RNP, log_time, lam = None, n_splines = n_splines)
+
+# Method name (folder under "Smoothing Methods"): smoothing function
+methods = {
+    "Gaussian Kernel": smooth_gaussian_kernel,
+    "Moving Average": smooth_moving_average,
+    "Lowess": smooth_lowess,
+    "Savitzky-Golay": smooth_savgol,
+    "GAM": smooth_gam,
+    "B-Spline": smooth_b_spline
+}
+
+# ----- Paper Grid -----
+def paper_grid():
+
+    # Parameters of the five methods compared in the paper
+    return {
+        "Gaussian Kernel": [{"sigma": 5}],
+        "GAM": [{}],
+        "B-Spline": [{"n_splines": 100}],
+        "Lowess": [{"span": span} for span in range(3, 21, 2)],
+        "Savitzky-Golay": [{"window": window, "order": order} for window in range(3, 13, 2) for order in range(1, min(max(window - 3, 1), 7) + 1)]
+    }
+
+# ----- Parameter Label -----
+def parameter_label(parameters):
+    return ", ".join(f"{name}={value}" for name, value in sorted(parameters.items()))
+
+# ----- Shared Arrays -----
+def share_array(array):
+
+    # Copy an array once into shared memory so tasks only pass its name
+    array = np.ascontiguousarray(array, dtype = np.float64)
+    block = shared_memory.SharedMemory(create = True, size = max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype = array.dtype, buffer = block.buf)[...] = array
+
+    return block, (block.name, array.shape)
+
+_worker = {}
+
+def _initialize_worker(shared, store_folder):
+
+    # Attach the shared true curve and time axis and open the memory-mapped store once per process
+    _worker.clear()
+    for name, (block_name, shape) in shared.items():
+        block = shared_memory.SharedMemory(name = block_name)
+        _worker[name + "_block"] = block
+        _worker[name] = np.ndarray(shape, dtype = np.float64, buffer = block.buf)
+    _worker["store"] = Dataset_Store.NoisyRNPStore(store_folder)
+
+# ----- Export Text Columns -----
+def write_columns(file_path, header, x, y):
+
+    with open(file_path, "w") as file:
+        # Write the header
+        file.write(header + "\n")
+
+        # Write the data to the file
+        file.write("".join(f"{a}\t{b}\n" for a, b in zip(x.tolist(), y.tolist())))
+
+# ----- Run One Task -----
+def run_task(task):
+
+    method, parameters, scenario, level, realizations, data_set_numbers, result_folder, keys = task
+    store = _worker["store"]
+    true_RNP = _worker["true_RNP"]
+    noisy_time = _worker["time"]
+
+    # Step 1: Take the block of noisy realizations as a view of the store
+    rows = [store.realization_index(realization) for realization in realizations]
+    log_RNP = store.select(scenario, level, log = True)[rows]
+    if np.isnan(log_RNP).any() or np.isinf(log_RNP).any():
+        raise ValueError("Data contains NaN or infinite values!")
+
+    # Step 2: Smooth the whole block in log-log space and transform back
+    smoothed_RNP = np.exp(methods[method](np.asarray(store.log_time), log_RNP, **parameters))
+
+    # Step 3: Relative residuals and error metrics against the true RNP
+    metrics = Smoothing_Metrics.compute_metrics(smoothed_RNP, true_RNP)
+    relative_residual = metrics["relative_residual"]
+
+    # Step 4: Export the smoothed and residual results of every data set
+    results = []
+    for k, data_set_number in enumerate(data_set_numbers):
+        subfolder_path = os.path.join(result_folder, f"Data Set {data_set_number}")
+        os.makedirs(subfolder_path, exist_ok = True)
+        write_columns(os.path.join(subfolder_path, f"smoothed_RNP_{data_set_number}.txt"), "t(days)\tsmoothed_RNP(psia2/cp-d/Mscf)", noisy_time, smoothed_RNP[k])
+        write_columns(os.path.join(subfolder_path, f"residual_{data_set_number}.txt"), "t(days)\tresidual_RNP(psia2/cp-d/Mscf)", noisy_time, relative_residual[k])
+        results.append((method, parameter_label(parameters), scenario, level, data_set_number, *(float(metrics[name][k]) for name in Smoothing_Metrics.metric_names), result_folder))
+
+    return results
+
+# Types of the result fields, as read back from the journal
+result_types = (str, str, str, int, int, float, float, float, float, str)
+
+# ----- Build Tasks -----
+def build_tasks(grid, store, scenarios, levels, output_folder, block_size, hashes = None, checkpoint = None):
+
+    tasks = []
+    for method, parameter_sets in grid.items():
+        if method not in methods:
+            raise ValueError(f"Unknown smoothing method: {method}")
+        for parameters in parameter_sets:
+            for scenario in scenarios:
+                for level in levels:
+                    # Data sets keep the paper numbering: 181-190 for 25%, 191-200 for 50%, 201-210 for 75%
+                    initial_data_set_number = 180 + store.level_index(level) * len(store.realizations)
+                    result_folder = os.path.join(output_folder, method)
+                    if scenario != "All":
+                        result_folder = os.path.join(result_folder, scenario)
+                    result_folder = os.path.join(result_folder, f"{level}%")
+                    if len(parameter_sets) > 1:
+                        result_folder = os.path.join(result_folder, parameter_label(parameters))
+
+                    # Skip the data sets the checkpoint already records as finished
+                    realizations = store.realizations
+                    keys = [None] * len(realizations)
+                    if hashes is not None:
+                        keys = [Experiment_Checkpoint.task_key(hashes[(scenario, level, realization)], method, parameters) for realization in realizations]
+                        if checkpoint is not None:
+                            pending = [(realization, key) for realization, key in zip(realizations, keys) if not checkpoint.done(key)]
+                            realizations, keys = [realization for realization, _ in pending], [key for _, key in pending]
+
+                    for start in range(0, len(realizations), block_size):
+                        block = realizations[start:start + block_size]
+                        data_set_numbers = [initial_data_set_number + store.realization_index(realization) + 1 for realization in block]
+                        tasks.append((method, parameters, scenario, level, block, data_set_numbers, result_folder, keys[start:start + block_size]))
+
+    return tasks
+
+# ----- Run Experiment -----
+def run_experiment(grid = None, scenarios = ("All",), levels = None, true_RNP_file_path = "true_RNP.txt",
+                   source_folder = "Noisy RNP Model", store_folder = "Noisy RNP Store", output_folder = "Smoothing Methods",
+                   max_workers = None, block_size = 16, resume = True):
+
+    # Step 1: Pack the noisy corpus once and read the true RNP
+    if not os.path.exists(os.path.join(store_folder, "index.json")):
+        Dataset_Store.pack_noisy_model(source_folder, store_folder)
+    store = Dataset_Store.NoisyRNPStore(store_folder)
+    true_time, true_RNP = Data_Reader.read_columns(true_RNP_file_path, skip_header = 1)[:2] # days, psia2/cp-d/Mscf
+    if not np.array_equal(true_time, store.time):
+        raise ValueError("Dimensions of time and RNP not match!")
+
+    grid = paper_grid() if grid is None else grid
+    scenarios = store.scenarios if scenarios is None else list(scenarios)
+    levels = store.levels if levels is None else [int(str(level).rstrip("%")) for level in levels]
+
+    # Step 2: Key every data set by its content, method and hyperparameters and resume from the manifest
+    columns = ("Method", "Parameters", "Scenario", "Level", "Data_Set", "SSE", "Log_RMSE", "MAE", "Max_Error", "Result_Folder")
+    hashes = Experiment_Checkpoint.content_hashes(store, true_RNP)
+    checkpoint = Experiment_Checkpoint.ExperimentCheckpoint(os.path.join(output_folder, "results_journal.txt"), columns)
+    requested = [key for task in build_tasks(grid, store, scenarios, levels, output_folder, len(store.realizations), hashes) for key in task[-1]]
+    tasks = build_tasks(grid, store, scenarios, levels, output_folder, block_size, hashes, checkpoint if resume else None)
+
+    # Step 3: Share the true curve and the time axis with every worker
+    blocks = {}
+    shared = {}
+    for name, array in (("true_RNP", true_RNP), ("time", true_time)):
+        blocks[name], shared[name] = share_array(array)
+
+    # Step 4: Run the pending data sets on a process pool, checkpointing every finished one
+    try:
+        if max_workers == 1:
+            _initialize_worker(shared, store_folder)
+            for task in tasks:
+                for key, record in zip(task[-1], run_task(task)):
+                    checkpoint.record(key, record)
+                checkpoint.sink.flush()
+        elif tasks:
+            with ProcessPoolExecutor(max_workers = max_workers, initializer = _initialize_worker, initargs = (shared, store_folder)) as executor:
+                for task, task_results in zip(tasks, executor.map(run_task, tasks)):
+                    for key, record in zip(task[-1], task_results):
+                        checkpoint.record(key, record)
+                    # Make every finished task durable before waiting on the next one
+                    checkpoint.sink.flush()
+        checkpoint.sink.flush()
+        results = [tuple(convert(value) for convert, value in zip(result_types, checkpoint.entries[key])) for key in requested]
+    finally:
+        checkpoint.close()
+        _worker.clear()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    # Step 5: Consolidate the requested records into the SSE table of every result folder
+    tables = {}
+    for method, label, scenario, level, data_set_number, sse, log_rmse, mae, max_error, result_folder in results:
+        tables.setdefault((result_folder, level), {})[data_set_number] = sse
+    for (result_folder, level), rows in tables.items():
+        Results_Sink.write_table(os.path.join(result_folder, f"SSE_results_{level}%.txt"), ("Data_Set", "SSE"), sorted(rows.items()))
+
+    return results
+
+# ----- Main Execution -----
+def main():
+
+    results = run_experiment()
+    print("----- Smoothing Experiment:", len(results), "data sets -----")
+    print("--- Smoothing Experiment Complete ---")
+
+    return
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Locally Weighted Scatterplot Smoothing (LOWESS)
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+import Smoothing_Operators
+
+# ----- Neighbor Windows -----
+def neighbor_windows(x, span):
+
+    # Step 1: On sorted x the span nearest neighbors of every point are contiguous.
+    # Sliding the window right helps while x[s] + x[s + span] < 2 x[i], so the first
+    # start where that fails is found for all points with one searchsorted
+    n = len(x)
+    start = np.searchsorted(x[:n - span] + x[span:], 2 * x, side = "left")
+
+    # Step 2: Tricube radius is the farthest neighbor in the window
+    dmax = np.maximum(x - x[start], x[start + span - 1] - x)
+
+    return start, dmax
+
+# ----- Local Linear Fits -----
+def local_linear_fit(x, y, start, dmax, span, robust_weights = None):
+
+    # Step 1: Gather the neighbors of every point, centered on the point itself
+    index = start[:, None] + np.arange(span)
+    dx = x[index] - x[:, None]
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        weight = np.clip(1 - (np.abs(dx) / dmax[:, None]) ** 3, 0, None) ** 3
+    weight[dmax == 0] = 1
+
+    # Step 2: Weighted moments of the windows, per series when robust weights are given
+    neighbors = y[:, index]
+    if robust_weights is not None:
+        weight = weight * robust_weights[:, index]
+    s0 = weight.sum(axis = -1)
+    s1 = (weight * dx).sum(axis = -1)
+    s2 = (weight * dx * dx).sum(axis = -1)
+    sy = (weight * neighbors).sum(axis = -1)
+    sxy = (weight * dx * neighbors).sum(axis = -1)
+
+    # Step 3: Intercept of the weighted line at the point, weighted mean when it is degenerate
+    determinant = s0 * s2 - s1 * s1
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        fitted = np.where(np.abs(determinant) > 1e-12 * np.maximum(s0 * s2, 1e-300), (s2 * sy - s1 * sxy) / determinant, sy / s0)
+
+    return fitted
+
+# ----- Bisquare Robust Weights -----
+def robust_weights(residual):
+
+    # Residuals beyond six median absolute residuals get no weight
+    scale = 6 * np.median(np.abs(residual), axis = -1, keepdims = True)
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        u = np.where(scale > 0, residual / scale, 0)
+
+    return np.where(np.abs(u) < 1, (1 - u * u) ** 2, 0)
+
+# ----- LOWESS Smoothing -----
+def lowess(y, span, x = None, robust = False, iterations = 5, chunk_size = 256):
+
+    # Step 1: Smooth on the sample index unless an x axis is given, as MATLAB smooth does
+    y = np.asarray(y, dtype = float)
+    series = y.reshape(-1, y.shape[-1])
+    n = series.shape[-1]
+    x = np.arange(1, n + 1, dtype = float) if x is None else np.asarray(x, dtype = float)
+    if x.shape != (n,):
+        raise ValueError("Dimensions of x and y not match!")
+    order = np.argsort(x, kind = "stable")
+    x = x[order]
+    series = series[:, order]
+
+    # Step 2: Uniform data forces an odd span; without robustness it is one cached linear operator
+    steps = np.diff(x)
+    uniform = n > 1 and np.allclose(steps, steps[0])
+    span = Smoothing_Operators.lowess_span(span, n) if uniform else min(int(span), n)
+    if span < 2:
+        return y.copy()
+    if uniform and not robust:
+        smoothed = Smoothing_Operators.apply_operator(Smoothing_Operators.smoothing_operator("lowess", x, span = span), series)
+
+    # Step 3: Otherwise fit the sliding-window local lines directly, O(n * span) per series
+    else:
+        start, dmax = neighbor_windows(x, span)
+        smoothed = np.empty_like(series)
+        for first in range(0, len(series), chunk_size):
+            block = series[first:first + chunk_size]
+            fitted = local_linear_fit(x, block, start, dmax, span)
+
+            # Step 4: Robustness iterations reweight the neighbors by their bisquare residual weight;
+            # a point whose neighbors all lost their weight keeps its previous fit instead of turning NaN
+            if robust:
+                for _ in range(iterations):
+                    refitted = local_linear_fit(x, block, start, dmax, span, robust_weights(block - fitted))
+                    fitted = np.where(np.isnan(refitted), fitted, refitted)
+            smoothed[first:first + chunk_size] = fitted
+
+    # Step 5: Restore the original order and shape
+    result = np.empty_like(smoothed)
+    result[:, order] = smoothed
+
+    return result.reshape(y.shape)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Smoothing Error Metrics
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+
+# Metrics of every smoothed curve; MAE and max error are taken on the relative residuals
+metric_names = ("sse", "log_rmse", "mae", "max_error")
+
+# ----- Allocate Metrics -----
+def allocate_metrics(shape, keep_residual = True):
+
+    # shape is the full (... x time) shape of the smoothed curves
+    out = {name: np.empty(shape[:-1]) for name in metric_names}
+    if keep_residual:
+        out["relative_residual"] = np.empty(shape)
+
+    return out
+
+# ----- Compute Metrics -----
+def compute_metrics(smoothed_RNP, true_RNP, out = None, keep_residual = True, normalization = 0.3413, chunk_rows = 4096):
+
+    # Step 1: View the curves as (curves x time) rows and prepare the outputs
+    smoothed_RNP = np.asarray(smoothed_RNP, dtype = float)
+    true_RNP = np.asarray(true_RNP, dtype = float)
+    shape = smoothed_RNP.shape
+    if out is None:
+        out = allocate_metrics(shape, keep_residual)
+    rows = smoothed_RNP.reshape(-1, shape[-1])
+    flat = {name: out[name].reshape(-1) for name in metric_names}
+    residual_rows = out["relative_residual"].reshape(-1, shape[-1]) if "relative_residual" in out else None
+    scale = 1 / (normalization * true_RNP)
+    log_true_RNP = np.log(true_RNP)
+
+    # Step 2: Work through fixed-size chunks with two scratch buffers
+    chunk_rows = max(1, min(chunk_rows, len(rows)))
+    residual_scratch = np.empty((chunk_rows, shape[-1]))
+    scratch = np.empty((chunk_rows, shape[-1]))
+    for start in range(0, len(rows), chunk_rows):
+        stop = min(start + chunk_rows, len(rows))
+        block = rows[start:stop]
+        residual = residual_scratch[:stop - start] if residual_rows is None else residual_rows[start:stop]
+        work = scratch[:stop - start]
+
+        # Step 3: Relative residuals (smoothed - true) / (0.3413 true) and their SSE
+        np.subtract(block, true_RNP, out = residual)
+        residual *= scale
+        np.einsum("ij,ij->i", residual, residual, out = flat["sse"][start:stop])
+
+        # Step 4: RMSE of the log-log deviation
+        np.log(block, out = work)
+        work -= log_true_RNP
+        np.einsum("ij,ij->i", work, work, out = flat["log_rmse"][start:stop])
+
+        # Step 5: Mean and maximum absolute relative residual
+        np.abs(residual, out = work)
+        np.mean(work, axis = 1, out = flat["mae"][start:stop])
+        np.max(work, axis = 1, out = flat["max_error"][start:stop])
+
+    np.divide(flat["log_rmse"], shape[-1], out = flat["log_rmse"])
+    np.sqrt(flat["log_rmse"], out = flat["log_rmse"])
+
+    return out
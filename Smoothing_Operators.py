@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Linear Smoothing Operators
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+from functools import lru_cache
+from scipy import sparse
+import Smoothing_SavGol
+
+# ----- Lowess Span -----
+def lowess_span(span, n):
+
+    # As in MATLAB smooth, uniform data forces an odd span no longer than the data
+    span = min(int(span), n)
+
+    return min(2 * (span // 2) + 1, n if n % 2 else n - 1)
+
+# ----- Lowess Edge Coefficients -----
+@lru_cache(maxsize = 64)
+def lowess_edge_coefficients(span):
+
+    # Step 1: The j-th point from either end is fitted on the span - 1 points at that end,
+    # with the tricube radius reaching the span-th point (MATLAB unifloess)
+    halfw = (span - 1) // 2
+    j = np.arange(1, halfw + 1, dtype = float)[:, None]
+    dx = np.arange(1, span, dtype = float)[None, :] - j
+    weight = np.clip(1 - (np.abs(dx) / (span - j)) ** 3, 0, None) ** 3
+
+    # Step 2: Closed-form weighted line through those points, evaluated at the j-th point
+    s0 = weight.sum(axis = 1, keepdims = True)
+    s1 = (weight * dx).sum(axis = 1, keepdims = True)
+    s2 = (weight * dx * dx).sum(axis = 1, keepdims = True)
+
+    return weight * (s2 - s1 * dx) / (s0 * s2 - s1 * s1)
+
+# ----- Gaussian Kernel Operator -----
+def gaussian_kernel_operator(n, time, sigma = 5, truncate = 4.0):
+
+    # Step 1: Normalized Gaussian weights, as in scipy.ndimage.gaussian_filter
+    radius = int(truncate * float(sigma) + 0.5)
+    offsets = np.arange(-radius, radius + 1)
+    weights = np.exp(-0.5 / float(sigma) ** 2 * offsets ** 2)
+    weights /= weights.sum()
+
+    # Step 2: Mirror the neighbors that fall outside the series ("reflect" mode)
+    rows = np.repeat(np.arange(n), len(offsets))
+    columns = np.mod(rows + np.tile(offsets, n), 2 * n)
+    columns = np.where(columns >= n, 2 * n - 1 - columns, columns)
+
+    return sparse.csr_matrix((np.tile(weights, n), (rows, columns)), shape = (n, n))
+
+# ----- Moving Average Operator -----
+def moving_average_operator(n, time, window = 5, edge = "symmetric"):
+
+    # Step 1: Centered window bounds of every point
+    halfw = (int(window) - 1) // 2
+    index = np.arange(n)
+    if edge == "symmetric":
+        # Shrink the window symmetrically near the ends, as in MATLAB smooth
+        reach = np.minimum(halfw, np.minimum(index, n - 1 - index))
+    elif edge == "shrink":
+        reach = np.full(n, halfw)
+    else:
+        raise ValueError(f"Unknown edge handling: {edge}")
+    start = np.maximum(index - reach, 0)
+    stop = np.minimum(index + reach + 1, n)
+
+    # Step 2: Equal weights over each truncated window
+    count = stop - start
+    rows = np.repeat(index, count)
+    columns = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count) + np.repeat(start, count)
+
+    return sparse.csr_matrix((np.repeat(1 / count, count), (rows, columns)), shape = (n, n))
+
+# ----- Savitzky-Golay Operator -----
+def savgol_operator(n, time, window = 5, order = 2):
+
+    # Step 1: Interior rows share the convolution coefficients
+    window = int(window)
+    halfw = (window - 1) // 2
+    if window % 2 == 0 or window > n or order >= window:
+        raise ValueError("Savitzky-Golay window must be odd, no longer than the data and longer than the order!")
+    coefficients, edge = Smoothing_SavGol.savgol_coefficients(window, order)
+    rows = np.repeat(np.arange(halfw, n - halfw), window)
+    columns = rows + np.tile(np.arange(-halfw, halfw + 1), n - 2 * halfw)
+    values = np.tile(coefficients, n - 2 * halfw)
+
+    # Step 2: End points evaluate the polynomial fitted to the first and last window, mirrored at the right end
+    edge_rows = np.repeat(np.arange(halfw), window)
+    edge_columns = np.tile(np.arange(window), halfw)
+    rows = np.concatenate((rows, edge_rows, n - 1 - edge_rows))
+    columns = np.concatenate((columns, edge_columns, n - 1 - edge_columns))
+    values = np.concatenate((values, edge.ravel(), edge.ravel()))
+
+    return sparse.csr_matrix((values, (rows, columns)), shape = (n, n))
+
+# ----- Lowess Operator -----
+def lowess_operator(n, time, span = 5):
+
+    # Step 1: MATLAB smooth(y, span, "lowess") fits on the sample index
+    span = lowess_span(span, n)
+    if span < 3:
+        return sparse.identity(n, format = "csr")
+    halfw = (span - 1) // 2
+
+    # Step 2: Interior points take the tricube-weighted mean of the span
+    offsets = np.arange(1 - halfw, halfw)
+    weights = (1 - (np.abs(offsets) / halfw) ** 3) ** 3
+    weights /= weights.sum()
+    rows = np.repeat(np.arange(halfw, n - halfw), len(offsets))
+    columns = rows + np.tile(offsets, n - 2 * halfw)
+    values = np.tile(weights, n - 2 * halfw)
+
+    # Step 3: End points use the one-sided local linear fits, mirrored at the right end
+    edge = lowess_edge_coefficients(span)
+    edge_rows = np.repeat(np.arange(halfw), span - 1)
+    edge_columns = np.tile(np.arange(span - 1), halfw)
+    rows = np.concatenate((rows, edge_rows, n - 1 - edge_rows))
+    columns = np.concatenate((columns, edge_columns, n - 1 - edge_columns))
+    values = np.concatenate((values, edge.ravel(), edge.ravel()))
+
+    return sparse.csr_matrix((values, (rows, columns)), shape = (n, n))
+
+# ----- Operator Registry -----
+# method: (builder, whether the operator depends on the time values and not only on their count)
+operators = {
+    "gaussian_kernel": (gaussian_kernel_operator, False),
+    "moving_average": (moving_average_operator, False),
+    "savgol": (savgol_operator, False),
+    "lowess": (lowess_operator, False)
+}
+
+@lru_cache(maxsize = 128)
+def _cached_operator(method, parameters, n, time_bytes):
+
+    builder, _ = operators[method]
+    time = None if time_bytes is None else np.frombuffer(time_bytes, dtype = np.float64)
+
+    return builder(n, time, **dict(parameters))
+
+# ----- Smoothing Operator -----
+def smoothing_operator(method, time, **parameters):
+
+    # Build the sparse smoothing matrix once per (method, parameters, time axis)
+    if method not in operators:
+        raise ValueError(f"Unknown smoothing method: {method}")
+    time = np.ascontiguousarray(time, dtype = np.float64)
+    _, uses_time = operators[method]
+    time_bytes = time.tobytes() if uses_time else None
+
+    return _cached_operator(method, tuple(sorted(parameters.items())), len(time), time_bytes)
+
+# ----- Apply Operator -----
+def apply_operator(operator, series):
+
+    # A single sparse product smooths every row of a (series x time) stack
+    series = np.asarray(series, dtype = float)
+    if series.ndim == 1:
+        return operator @ series
+
+    return np.asarray(operator @ series.reshape(-1, series.shape[-1]).T).T.reshape(series.shape)
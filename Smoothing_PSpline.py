@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Penalized B-Spline (P-Spline) Smoothing
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+from functools import lru_cache
+from scipy.interpolate import BSpline
+from scipy.linalg import cholesky, eigh, solve_triangular
+
+# Smoothing penalties searched by default, as in pygam gridsearch
+lam_grid = np.logspace(-3, 3, 11)
+
+# ----- B-Spline Knots -----
+def pspline_knots(x_min, x_max, n_splines = 20, degree = 3):
+
+    # Equally spaced knots over the data range, extended by degree knots at both ends
+    if n_splines < degree + 1:
+        raise ValueError("Number of splines must exceed the spline degree!")
+    step = (x_max - x_min) / (n_splines - degree) if x_max > x_min else 1
+    return x_min + step * np.arange(-degree, n_splines + 1)
+
+# ----- B-Spline Basis -----
+def pspline_basis(x, knots, degree = 3):
+
+    # Dense basis matrix, one column per spline, points clipped to the knot span of the data
+    x = np.clip(np.asarray(x, dtype = float), knots[degree], knots[-degree - 1])
+    return BSpline.design_matrix(x, knots, degree).toarray()
+
+# ----- Difference Penalty -----
+def difference_penalty(n_splines, order = 2):
+
+    # D'D of the order-th differences of neighbouring coefficients
+    D = np.diff(np.eye(n_splines), n = order, axis = 0)
+    return D.T @ D
+
+# ----- Demmler-Reinsch Basis -----
+@lru_cache(maxsize = 16)
+def pspline_eigensystem(x_bytes, n_splines = 20, degree = 3, penalty_order = 2):
+
+    # Step 1: Basis and penalty of the axis, built once per axis
+    x = np.frombuffer(x_bytes, dtype = np.float64)
+    knots = pspline_knots(x.min(), x.max(), n_splines, degree)
+    basis = pspline_basis(x, knots, degree)
+    penalty = difference_penalty(n_splines, penalty_order)
+
+    # Step 2: Cholesky factor of B'B + P, which stays well conditioned where splines hold no data
+    gram = basis.T @ basis
+    L = cholesky(gram + penalty, lower = True)
+
+    # Step 3: Eigenvectors of L^-1 P L^-T diagonalize B'B and P together, with eigenvalues mu in [0, 1]
+    M = solve_triangular(L, solve_triangular(L, penalty, lower = True).T, lower = True)
+    mu, U = eigh((M + M.T) / 2)
+    mu = np.clip(mu, 0, 1)
+
+    # Step 4: Rescale to a basis orthonormal over the data points, with penalty eigenvalues mu / (1 - mu);
+    # directions with mu = 1 carry no data and drop out of every fit
+    keep = 1 - mu > 1e-12
+    transform = solve_triangular(L, U[:, keep], lower = True, trans = "T") / np.sqrt(1 - mu[keep])
+    eigenvalues = mu[keep] / (1 - mu[keep])
+
+    return basis @ transform, eigenvalues, knots, transform
+
+# ----- Select Smoothing Penalty -----
+def pspline_gcv(y, x, lams = lam_grid, n_splines = 20, degree = 3, penalty_order = 2, gamma = 1.4):
+
+    # Step 1: Project every series on the Demmler-Reinsch basis once
+    y = np.atleast_2d(np.asarray(y, dtype = float))
+    x = np.ascontiguousarray(x, dtype = np.float64)
+    design, eigenvalues, _, _ = pspline_eigensystem(x.tobytes(), n_splines, degree, penalty_order)
+    n = design.shape[0]
+    projection = y @ design
+    residual_base = np.einsum("ij,ij->i", y, y) - np.einsum("ij,ij->i", projection, projection)
+
+    # Step 2: RSS and effective degrees of freedom of every penalty in O(k) per series
+    lams = np.asarray(lams, dtype = float)
+    shrinkage = lams[:, None] * eigenvalues / (1 + lams[:, None] * eigenvalues)
+    edof = np.sum(1 - shrinkage, axis = 1)
+    rss = np.maximum(residual_base[:, None] + (projection * projection) @ (shrinkage * shrinkage).T, 0)
+
+    # Step 3: Generalized cross-validation score, with pygam's gamma inflation of the degrees of freedom
+    gcv = n * rss / (n - gamma * edof) ** 2
+
+    return lams[np.argmin(gcv, axis = 1)], gcv
+
+# ----- P-Spline Smoothing -----
+def pspline(y, x, lam = 0.6, n_splines = 20, degree = 3, penalty_order = 2, x_new = None, lams = lam_grid, gamma = 1.4):
+
+    # Step 1: Pick the penalty of every series by GCV when none is given
+    y = np.asarray(y, dtype = float)
+    x = np.ascontiguousarray(x, dtype = np.float64)
+    series = np.atleast_2d(y)
+    if lam is None:
+        lam = pspline_gcv(series, x, lams, n_splines, degree, penalty_order, gamma)[0]
+    lam = np.broadcast_to(np.asarray(lam, dtype = float), (len(series),))
+
+    # Step 2: Shrink the projections on the Demmler-Reinsch basis
+    design, eigenvalues, knots, transform = pspline_eigensystem(x.tobytes(), n_splines, degree, penalty_order)
+    coefficients = (series @ design) / (1 + lam[:, None] * eigenvalues)
+
+    # Step 3: Evaluate on the data points, or on any other grid of the same axis
+    if x_new is not None:
+        design = pspline_basis(x_new, knots, degree) @ transform
+    smoothed = coefficients @ design.T
+
+    return smoothed if y.ndim > 1 else smoothed[0]
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Linear and Polynomial Regression
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+from functools import lru_cache
+from numpy.polynomial import legendre
+
+# ----- Plotting Grid -----
+def plot_grid(x, n = 100):
+
+    return np.linspace(np.min(x), np.max(x), n)
+
+# ----- Design Matrix -----
+def design_matrix(x, degree, center, scale):
+
+    # Legendre Vandermonde matrix of x scaled to [-1, 1], better conditioned than raw powers
+    return legendre.legvander((np.asarray(x, dtype = float) - center) / scale, degree)
+
+# ----- QR Factorization -----
+@lru_cache(maxsize = 32)
+def regression_factorization(x_bytes, degree):
+
+    # Step 1: Scale the axis to [-1, 1]
+    x = np.frombuffer(x_bytes, dtype = np.float64)
+    if len(x) <= degree:
+        raise ValueError("Not enough points for the polynomial degree!")
+    center = (x.max() + x.min()) / 2
+    scale = (x.max() - x.min()) / 2 if x.max() > x.min() else 1
+
+    # Step 2: One QR of the highest-degree design matrix serves every lower degree,
+    # since its first d + 1 columns of Q span the polynomials of degree d
+    Q, R = np.linalg.qr(design_matrix(x, degree, center, scale))
+
+    return Q, R, center, scale
+
+# ----- Polynomial Regression -----
+def polynomial_regression(y, x, degrees = (1,), x_plot = None):
+
+    # Step 1: Factor the shared design matrix once for all series and degrees
+    y = np.asarray(y, dtype = float)
+    series = np.atleast_2d(y)
+    x = np.ascontiguousarray(x, dtype = np.float64)
+    Q, R, center, scale = regression_factorization(x.tobytes(), max(degrees))
+    projection = series @ Q
+    plot_design = None if x_plot is None else design_matrix(x_plot, max(degrees), center, scale)
+
+    # Step 2: Least-squares fit of every degree on the data grid, and on the plotting grid
+    fitted = {}
+    plotted = {}
+    for degree in degrees:
+        m = degree + 1
+        fitted[degree] = projection[:, :m] @ Q[:, :m].T
+        if plot_design is not None:
+            coefficients = np.linalg.solve(R[:m, :m], projection[:, :m].T).T
+            plotted[degree] = coefficients @ plot_design[:, :m].T
+        if y.ndim == 1:
+            fitted[degree] = fitted[degree][0]
+            if plot_design is not None:
+                plotted[degree] = plotted[degree][0]
+
+    return fitted, plotted
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Savitzky-Golay Smoothing
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+from functools import lru_cache
+from scipy.ndimage import correlate1d
+from scipy.signal import savgol_coeffs
+
+# ----- Savitzky-Golay Window -----
+def savgol_window(window, order, n):
+
+    # As in MATLAB smooth, an even window is reduced by one; it must also exceed the order
+    window = min(int(window), n if n % 2 else n - 1)
+    window -= 1 - window % 2
+    if order >= window:
+        raise ValueError("Savitzky-Golay order must be smaller than the window!")
+
+    return window
+
+# ----- Uniform Coefficients -----
+@lru_cache(maxsize = 128)
+def savgol_coefficients(window, order):
+
+    # Step 1: Interior points share one set of convolution coefficients
+    interior = savgol_coeffs(window, order, use = "dot")
+
+    # Step 2: The first and last half-windows evaluate the polynomial fitted to the end window,
+    # on a centered axis scaled to [-1, 1] for conditioning (the fitted values do not depend on it)
+    vander = np.vander(np.linspace(-1, 1, window), order + 1, increasing = True)
+    edge = (vander @ np.linalg.pinv(vander))[:(window - 1) // 2]
+
+    return interior, edge
+
+# ----- Non-uniform Coefficients -----
+@lru_cache(maxsize = 32)
+def savgol_nonuniform_coefficients(x_bytes, window, order):
+
+    # Step 1: Window of every point, shifted inwards at the ends
+    x = np.frombuffer(x_bytes, dtype = np.float64)
+    n = len(x)
+    start = np.clip(np.arange(n) - (window - 1) // 2, 0, n - window)
+    index = start[:, None] + np.arange(window)
+
+    # Step 2: Fit the local polynomial in (x - x_i), scaled per window for conditioning,
+    # and keep the row of the pseudo-inverse that gives its value at x_i
+    dx = x[index] - x[:, None]
+    scale = np.abs(dx).max(axis = 1, keepdims = True)
+    scale[scale == 0] = 1
+    vander = (dx / scale)[:, :, None] ** np.arange(order + 1)
+    coefficients = np.linalg.pinv(vander)[:, 0, :]
+
+    return index, coefficients
+
+# ----- Savitzky-Golay Smoothing -----
+def savgol(y, window = 5, order = 2, x = None):
+
+    y = np.asarray(y, dtype = float)
+    series = y.reshape(-1, y.shape[-1])
+    n = series.shape[-1]
+    window = savgol_window(window, order, n)
+    halfw = (window - 1) // 2
+
+    # Step 1: Uniform spacing is one correlation over the whole batch plus the end windows
+    if x is None:
+        interior, edge = savgol_coefficients(window, order)
+        smoothed = correlate1d(series, interior, axis = -1, mode = "constant")
+        smoothed[:, :halfw] = series[:, :window] @ edge.T
+        smoothed[:, n - halfw:] = (series[:, ::-1][:, :window] @ edge.T)[:, ::-1]
+
+    # Step 2: Non-uniform spacing (e.g. log-spaced RNP samples) fits the polynomial in x itself
+    else:
+        x = np.ascontiguousarray(x, dtype = np.float64)
+        if x.shape != (n,):
+            raise ValueError("Dimensions of x and y not match!")
+        index, coefficients = savgol_nonuniform_coefficients(x.tobytes(), window, order)
+        smoothed = np.einsum("mnw,nw->mn", series[:, index], coefficients)
+
+    return smoothed.reshape(y.shape)
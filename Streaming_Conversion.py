@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming RNP Conversion
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import itertools
+import numpy as np
+import Data_Reader
+import Pseudopressure_Conversion
+
+# Fields of every block of RNP records yielded by the stream
+record_fields = ("time", "pseudotime", "material_balance_time", "delta_pseudopressure", "RNP")
+
+# ----- Gauge Chunks -----
+def gauge_chunks(bhp_file_path, rate_file_path, reservoir_file_path = None, chunk_rows = 65536):
+
+    # Step 1: Read the gauge files side by side in blocks of rows (two header lines, time in hours)
+    readers = [Data_Reader.iter_columns(bhp_file_path, skip_header = 2, chunk_rows = chunk_rows),
+               Data_Reader.iter_columns(rate_file_path, skip_header = 2, chunk_rows = chunk_rows)]
+    if reservoir_file_path is not None:
+        readers.append(Data_Reader.iter_columns(reservoir_file_path, skip_header = 2, chunk_rows = chunk_rows))
+
+    # Step 2: Yield (t, bhp, rate[, reservoir pressure]) with time in days, once every file is checked
+    # to have the same rows on the same time axis as the bottomhole pressure
+    names = ("rate", "reservoir pressure")
+    for blocks in itertools.zip_longest(*readers):
+        if any(block is None for block in blocks):
+            raise ValueError("Gauge files have different numbers of rows!")
+        time, bhp = blocks[0][:2] # hrs., psia
+        for name, block in zip(names, blocks[1:]):
+            if not np.array_equal(block[0], time):
+                raise ValueError(f"Time axis of the {name} file does not match the bottomhole pressure file!")
+        rate = blocks[1][1] # Mscf/d
+        chunk = (time / 24, bhp, rate) # days, psia, Mscf/d
+        if reservoir_file_path is not None:
+            chunk += (blocks[2][1],) # psia
+        yield chunk
+
+# ----- Convert Stream -----
+def convert_stream(chunks, table, initial_pressure = None):
+
+    # State carried across chunks: the last sample of both integrands and their running integrals
+    pseudopressure_i = mug_ct_i = None
+    last_time = last_integrand = last_rate = None
+    pseudotime_integral = cumulative_production = 0.0
+    buffer = np.empty(0)
+
+    for chunk in chunks:
+        time, bhp, rate = (np.asarray(values, dtype = float) for values in chunk[:3])
+        res_pressure = np.asarray(chunk[3], dtype = float) if len(chunk) > 3 else None
+        n = len(time)
+        if not n:
+            continue
+
+        # Step 1: Initial conditions from the first sample of the stream
+        if pseudopressure_i is None:
+            if initial_pressure is None:
+                if res_pressure is None:
+                    raise ValueError("Initial pressure is needed when no reservoir pressure is streamed!")
+                initial_pressure = res_pressure[0]
+            mug_i, ct_i, pseudopressure_i = table.lookup(np.array([initial_pressure]), properties = ("mug", "ct", "pseudopressure"))[:, 0]
+            mug_ct_i = mug_i * ct_i # cp/psi
+
+        # Step 2: Pseudopressure of the bottomhole pressure through buffers reused from chunk to chunk
+        if len(buffer) < n:
+            buffer = np.empty(n)
+        bhp_pseudopressure = table.pseudopressure(bhp, out = buffer[:n])
+        delta_pseudopressure = pseudopressure_i - bhp_pseudopressure # psia2/cp
+
+        # Step 3: Integrand of pseudotime, 1/(mu*ct) at the reservoir pressure or at initial conditions
+        if res_pressure is None:
+            integrand = np.full(n, 1 / mug_ct_i)
+        else:
+            properties = table.lookup(res_pressure, properties = ("mug", "ct"))
+            integrand = 1 / (properties[0] * properties[1])
+
+        # Step 4: Advance the trapezoid integrals of pseudotime and produced volume from the carried sample
+        if last_time is None:
+            # The first interval runs from time zero at the first sample's value
+            previous_time, previous_integrand, previous_rate = 0.0, integrand[0], rate[0]
+        else:
+            previous_time, previous_integrand, previous_rate = last_time, last_integrand, last_rate
+        dt = np.diff(time, prepend = previous_time)
+        pseudotime = pseudotime_integral + np.cumsum(0.5 * (integrand + np.concatenate(([previous_integrand], integrand[:-1]))) * dt)
+        production = cumulative_production + np.cumsum(0.5 * (rate + np.concatenate(([previous_rate], rate[:-1]))) * dt) # Mscf
+        pseudotime_integral, cumulative_production = pseudotime[-1], production[-1]
+        last_time, last_integrand, last_rate = time[-1], integrand[-1], rate[-1]
+
+        # Step 5: Yield the RNP records of the chunk (shut-in samples with zero rate give infinite values)
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            material_balance_time = production / rate # days
+            RNP = delta_pseudopressure / rate # psia2/cp-d/Mscf
+        yield {
+            "time": time, # days
+            "pseudotime": pseudotime * mug_ct_i, # days
+            "material_balance_time": material_balance_time,
+            "delta_pseudopressure": delta_pseudopressure, # psia2/cp
+            "RNP": RNP
+        }
+
+# ----- Main Execution -----
+def main():
+
+    # Stream the synthetic model's gauge files into an RNP table without loading them whole
+    pvt_pressure, pvt_Z, pvt_mug, pvt_cg = Pseudopressure_Conversion.read_gas_properties(Pseudopressure_Conversion.gas_properties_file_path) # psia, , cp, 1/psi
+    table = Pseudopressure_Conversion.PVTTable(pvt_pressure, pvt_Z, pvt_mug, pvt_cg)
+    rate_file_path = Pseudopressure_Conversion.bhp_file_path.replace("bhp.txt", "downhole_gas_rate.txt")
+    chunks = gauge_chunks(Pseudopressure_Conversion.bhp_file_path, rate_file_path, Pseudopressure_Conversion.reservoir_file_path)
+
+    with open("streamed_RNP.txt", "w") as file:
+        # Write the header
+        file.write("t(days)\tta(days)\ttmb(days)\tRNP(psia2/cp-d/Mscf)\n")
+
+        # Write the data to the file as every chunk arrives
+        for records in convert_stream(chunks, table):
+            file.write("".join(f"{a}\t{b}\t{c}\t{d}\n" for a, b, c, d in zip(records["time"].tolist(), records["pseudotime"].tolist(),
+                                                                            records["material_balance_time"].tolist(), records["RNP"].tolist())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming Online Smoother
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+from functools import lru_cache
+import Smoothing_Operators
+
+# ----- Streaming Stencils -----
+@lru_cache(maxsize = 64)
+def _streaming_stencil(method, parameters):
+
+    # Step 1: Grow a sample operator until its middle rows are clear of both edges
+    n = 33
+    while True:
+        operator = Smoothing_Operators.smoothing_operator(method, np.arange(n, dtype = float), **dict(parameters)).toarray()
+        middle = n // 2
+        nonzero = np.flatnonzero(operator[middle])
+        halfw = int(max(middle - nonzero[0], nonzero[-1] - middle))
+        interior = operator[middle, middle - halfw:middle + halfw + 1].copy()
+
+        # Edge rows are the rows at each end that differ from the shifted interior stencil
+        shifted = np.zeros((n, n + 2 * halfw))
+        shifted[np.arange(n)[:, None], np.arange(n)[:, None] + np.arange(2 * halfw + 1)] = interior
+        differs = ~np.isclose(operator, shifted[:, halfw:n + halfw], rtol = 0, atol = 1e-12).all(axis = 1)
+        edge = max(int(np.argmin(differs[:middle])), int(np.argmin(differs[::-1][:middle])), halfw)
+        support = max([1] + [np.flatnonzero(row)[-1] + 1 for row in operator[:edge]] + [n - np.flatnonzero(row)[0] for row in operator[n - edge:]])
+        width = int(max(edge + halfw + 2, support, 2 * edge + 1))
+        if 2 * width + 1 <= n:
+            break
+        n = 2 * n + 1
+
+    # Step 2: Interior weights and the edge rows over the first and last windows
+    left = operator[:edge, :width].copy()
+    right = operator[n - edge:, n - width:].copy()
+
+    return edge, halfw, interior, left, right, width
+
+def streaming_stencil(method, **parameters):
+
+    # Stencils are read off the batch operator, so the stream reproduces it exactly
+    return _streaming_stencil(method, tuple(sorted(parameters.items())))
+
+# ----- Streaming Smoother -----
+class StreamingSmoother:
+    """Online smoother that finalizes each value once its right-hand window is complete."""
+
+    def __init__(self, method, **parameters):
+
+        self.method = method
+        self.parameters = parameters
+        self.edge, self.halfw, self.interior, self.left, self.right, self.width = streaming_stencil(method, **parameters)
+
+        # Ring buffer of the last window, written twice so that it is always readable as one contiguous slice
+        self._buffer = np.zeros(2 * self.width)
+        self._head = 0
+        self.count = 0
+        self.finalized = 0
+
+        # A uniform interior stencil is applied as a running sum
+        self._uniform = np.allclose(self.interior, self.interior[0])
+        self._sum = 0.0
+
+    def window(self):
+
+        # The last min(count, width) samples in arrival order
+        size = min(self.count, self.width)
+        return self._buffer[self._head + self.width - size:self._head + self.width]
+
+    def update(self, value):
+
+        # Step 1: Push the sample into the ring buffer, keeping the sum of the newest interior window
+        value = float(value)
+        self._buffer[self._head] = value
+        self._buffer[self._head + self.width] = value
+        self._head = (self._head + 1) % self.width
+        self.count += 1
+        if self._uniform:
+            # The window trails the newest sample by the edge rows beyond the half-width; unwritten slots hold zeros
+            stop = self._head + self.width - (self.edge - self.halfw)
+            start = stop - len(self.interior)
+            self._sum += self._buffer[stop - 1] - self._buffer[start - 1]
+            if self._head == 0:
+                # Resum once per ring cycle to stop round-off from drifting
+                self._sum = float(np.sum(self._buffer[start:stop]))
+
+        # Step 2: Finalize the values that are no longer within the edge rows of the tail
+        if self.count < self.width:
+            return np.empty(0)
+        window = self.window()
+        lag = self.width - self.edge - self.halfw - 1
+        if self._uniform:
+            center = self._sum * self.interior[0]
+        else:
+            center = float(self.interior @ window[lag:lag + len(self.interior)])
+        if self.count == self.width:
+            # The first full window also settles the head of the series
+            start = np.arange(self.edge, self.width - self.edge - 1)
+            head = window[start[:, None] - self.halfw + np.arange(len(self.interior))] @ self.interior
+            finalized = np.concatenate((self.left @ window, head, [center]))
+        else:
+            finalized = np.array([center])
+        self.finalized += len(finalized)
+
+        return finalized
+
+    def extend(self, values):
+
+        finalized = [self.update(value) for value in np.asarray(values, dtype = float).ravel()]
+        return np.concatenate(finalized) if finalized else np.empty(0)
+
+    def provisional(self):
+
+        # Current estimates of the values not yet finalized, revised as samples arrive
+        if self.count < self.width:
+            # Short streams are smoothed with the batch operator of their own length
+            if not self.count:
+                return np.empty(0)
+            try:
+                operator = Smoothing_Operators.smoothing_operator(self.method, np.arange(self.count, dtype = float), **self.parameters)
+            except ValueError:
+                # Too few samples for the method's window yet
+                return self.window().copy()
+            return Smoothing_Operators.apply_operator(operator, self.window())
+
+        return self.right @ self.window()
+
+    def flush(self):
+
+        # At the end of the stream the provisional tail is final
+        tail = self.provisional()
+        self.finalized += len(tail)
+
+        return tail
@@ -7,6 +7,8 @@ Created on Wednesday, 1 November 2023
 """
 
 import numpy as np
+import Data_Reader
+import Flow_Regime_Segmentation
 import matplotlib.pyplot as plt
 import Pseudopressure_Conversion
 from scipy.stats import linregress
@@ -14,60 +16,24 @@ from scipy.stats import linregress
 # Import True RNP Data
 def read_true_RNP(file_path):
 
-    # Step 1: Open the text file
-    with open(file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    true_time = []
-    true_RNP = []
-    
-    # Process each subsequent line and append the values
-    for line in lines[1:]:
-        values = line.split()
-        if len(values) >= 2:
-            true_time.append(float(values[0]))
-            true_RNP.append(float(values[1]))
+    # Parse the two data columns below the header line
+    true_time, true_RNP = Data_Reader.read_columns(file_path, skip_header = 1)[:2]
     
     return true_time, true_RNP
 
 # Import Noisy RNP Data
 def read_noisy_RNP(file_path):
 
-    # Step 1: Open the text file
-    with open(file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    noisy_time = []
-    noisy_RNP = []
-    
-    # Process each subsequent line and append the values
-    for line in lines[1:]:
-        values = line.split()
-        if len(values) >= 2:
-            noisy_time.append(float(values[0]))
-            noisy_RNP.append(float(values[1]))
+    # Parse the two data columns below the header line
+    noisy_time, noisy_RNP = Data_Reader.read_columns(file_path, skip_header = 1)[:2]
     
     return noisy_time, noisy_RNP
 
 # ----- Import Smoothed RNP Data -----
 def read_smoothed_RNP (file_path):
 
-    # Step 1: Open the text file
-    with open (file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    noisy_time = []
-    noisy_RNP = []
-    
-    # Step 3: Process each subsequent line and append the values
-    for line in lines[1:]:
-        values = line.split()
-        if len(values) >= 2:
-            noisy_time.append(float(values[0]))
-            noisy_RNP.append(float(values[1]))
+    # Parse the two data columns below the header line
+    noisy_time, noisy_RNP = Data_Reader.read_columns(file_path, skip_header = 1)[:2]
     
     return noisy_time, noisy_RNP
 
@@ -96,53 +62,25 @@ def main():
     smoothed_time = np.array(smoothed_time) # days
     smoothed_RNP = np.array(smoothed_RNP) # psia2/cp-d/Mscf
 
-    # Filter RNP data
-    filtered_time = true_time <= 5000
-    filtered_true_time = true_time[filtered_time]
-    filtered_true_RNP = true_RNP[filtered_time]
-    filtered_noisy_time = noisy_time[filtered_time]
-    filtered_noisy_RNP = noisy_RNP[filtered_time]
-    filtered_smootherd_time = smoothed_time[filtered_time]
-    filtered_smoothed_RNP = smoothed_RNP[filtered_time]
-
-    # Find the interval where the slope is close to 0.5
+    # Fit the linear-flow window: the half-slope segment of the flow regimes, or the longest half-slope interval
     desired_slope = 0.5
-    slope_tolerance = 0.01
-    r_value_tolerance = 0.7
-
-    # Find interval of noisy time with slope 0.5
-    #print("Noisy RNP results:")
-    for window_size in range(2, len(filtered_noisy_time) + 1):
-        for start_index in range(len(filtered_noisy_time) - window_size + 1):
-            log_x = np.log(filtered_noisy_time[start_index:start_index + window_size])
-            log_y = np.log(filtered_noisy_RNP[start_index:start_index + window_size])
-            slope, intercept, r_value = calculate_slope(log_x, log_y)
-            if abs(slope - desired_slope) < slope_tolerance and r_value > r_value_tolerance:
-                end_index = start_index + window_size - 1
-                #print(f"Interval with a slope:", slope, "and Rsquared:", r_value, "and intercept:", intercept)
-                #print("Start transient time:", filtered_noisy_time[start_index])
-                #print("End transient time:", filtered_noisy_time[end_index])
-                #print("")
-
-    fitted_noisy_time = noisy_time[(noisy_time > 0.3 - 1) & (noisy_time < 1405.0 + 1)]
-    fitted_noisy_RNP = np.exp([15.5146989788083 + 0.490097495690205 * np.log(fitted_noisy_time[i]) for i in range(len(fitted_noisy_time))])
-    
-    # Find interval of smoothed time with slope 0.5
-    #print("Smoothed RNP results:")
-    for window_size in range(2, len(filtered_smootherd_time) + 1):
-        for start_index in range(len(filtered_smootherd_time) - window_size + 1):
-            log_x = np.log(filtered_smootherd_time[start_index:start_index + window_size])
-            log_y = np.log(filtered_smoothed_RNP[start_index:start_index + window_size])
-            slope, intercept, r_value = calculate_slope(log_x, log_y)
-            if abs(slope - desired_slope) < slope_tolerance and r_value > r_value_tolerance:
-                end_index = start_index + window_size - 1
-                #print(f"Interval with a slope:", slope, "and Rsquared:", r_value, "and intercept:", intercept)
-                #print("Start transient time:", filtered_noisy_time[start_index])
-                #print("End transient time:", filtered_noisy_time[end_index])
-                #print("")
+
+    # Linear-flow window of the noisy RNP
+    noisy_linear_flow = Flow_Regime_Segmentation.linear_flow_window(noisy_time, noisy_RNP, desired_slope = desired_slope)
+    if noisy_linear_flow is None:
+        raise ValueError("No linear flow window found in the noisy RNP!")
+    noisy_linear_range = slice(noisy_linear_flow["start"], noisy_linear_flow["end"] + 1)
+    fitted_noisy_time = noisy_time[noisy_linear_range]
+    fitted_noisy_RNP = np.exp(noisy_linear_flow["intercept"] + noisy_linear_flow["slope"] * np.log(fitted_noisy_time))
     
-    fitted_smoothed_time = smoothed_time[(smoothed_time > 125.0 - 1) & (smoothed_time < 4402.0 + 1)]
-    fitted_smoothed_RNP = np.exp([15.2748526972262 + 0.49906299342644 * np.log(fitted_smoothed_time[i]) for i in range(len(fitted_smoothed_time))])
+    # Linear-flow window of the smoothed RNP, segmented at the noise level of the noisy RNP
+    noise_std = np.sqrt(Flow_Regime_Segmentation.noise_variance(np.log(noisy_RNP)))
+    smoothed_linear_flow = Flow_Regime_Segmentation.linear_flow_window(smoothed_time, smoothed_RNP, noise_std = noise_std, desired_slope = desired_slope)
+    if smoothed_linear_flow is None:
+        raise ValueError("No linear flow window found in the smoothed RNP!")
+    smoothed_linear_range = slice(smoothed_linear_flow["start"], smoothed_linear_flow["end"] + 1)
+    fitted_smoothed_time = smoothed_time[smoothed_linear_range]
+    fitted_smoothed_RNP = np.exp(smoothed_linear_flow["intercept"] + smoothed_linear_flow["slope"] * np.log(fitted_smoothed_time))
     
     # Plot RNP vs time
     plt.figure()
@@ -163,28 +101,25 @@ def main():
     plt.show()
 
     # Define linear flow time data
-    pseudotime = np.array(Pseudopressure_Conversion.pseudotime)
+    conversion = Pseudopressure_Conversion.PseudopressureConversion.from_files()
+    pseudotime = np.array(conversion.pseudotime)
     pseudotime = pseudotime[1:]
 
     true_linear_pseudotime = np.array(pseudotime[true_time < 4000])
     true_sqrt_pseudotime = np.sqrt(true_linear_pseudotime)
     true_linear_RNP = true_RNP[(true_time < 4000)]
     
-    noisy_start_index = np.where(noisy_time == 0.25)[0][0]
-    noisy_linear_pseudotime = [pseudotime[i] for i in range(noisy_start_index, noisy_start_index + len(fitted_noisy_time))]
-    noisy_linear_pseudotime = np.array(noisy_linear_pseudotime)
+    noisy_linear_pseudotime = np.array(pseudotime[noisy_linear_range])
     noisy_sqrt_pseudotime = np.sqrt(noisy_linear_pseudotime)
     #noisy_linear_time = np.array(fitted_noisy_time)
     #noisy_sqrt_time = np.sqrt(noisy_linear_time)
-    noisy_linear_RNP = noisy_RNP[(noisy_time > 0.3 - 1) & (noisy_time < 1405.0 + 1)]
+    noisy_linear_RNP = noisy_RNP[noisy_linear_range]
     
-    smoothed_start_index = np.where(smoothed_time == 124.9920833)[0][0]
-    smoothed_linear_pseudotime = [pseudotime[i] for i in range(smoothed_start_index, smoothed_start_index + len(fitted_smoothed_time))]
-    smoothed_linear_pseudotime = np.array(smoothed_linear_pseudotime)
+    smoothed_linear_pseudotime = np.array(pseudotime[smoothed_linear_range])
     smoothed_sqrt_pseudotime = np.sqrt(smoothed_linear_pseudotime)
     #smoothed_linear_time = np.array(fitted_smoothed_time)
     #smoothed_sqrt_time = np.sqrt(smoothed_linear_time)
-    smoothed_linear_RNP = smoothed_RNP[(smoothed_time > 125.0 - 1) & (smoothed_time < 4402.0 + 1)]
+    smoothed_linear_RNP = smoothed_RNP[smoothed_linear_range]
 
     # Calculate linear slope for square-root time
     true_linear_slope, true_linear_intercept, true_linear_r_value = calculate_slope(true_sqrt_pseudotime, true_linear_RNP)
@@ -207,7 +142,7 @@ def main():
     h = 100 # ft
     phi = 0.05 # fraction
     miugi = 0.026527595 # cp
-    cti = Pseudopressure_Conversion.cti
+    cti = conversion.cti
     
     # Extracted properties
     true_kxf = ((40.93 * T) / (true_linear_slope * h * np.sqrt(phi * miugi * cti))) ** 2
@@ -7,65 +7,30 @@ Created on Wednesday, 1 November 2023
 """
 
 import numpy as np
+import Data_Reader
 import matplotlib.pyplot as plt
 
 # Import Noisy RNP Data
 def read_noisy_RNP(file_path):
 
-    # Step 1: Open the text file
-    with open(file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    noisy_time = []
-    noisy_RNP = []
-    
-    # Process each subsequent line and append the values
-    for line in lines[1:]:
-        values = line.split()
-        if len(values) >= 2:
-            noisy_time.append(float(values[0]))
-            noisy_RNP.append(float(values[1]))
+    # Parse the two data columns below the header line
+    noisy_time, noisy_RNP = Data_Reader.read_columns(file_path, skip_header = 1)[:2]
     
     return noisy_time, noisy_RNP
 
 # ----- Import Smoothed RNP Data -----
 def read_smoothed_RNP (file_path):
 
-    # Step 1: Open the text file
-    with open (file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    noisy_time = []
-    noisy_RNP = []
-    
-    # Step 3: Process each subsequent line and append the values
-    for line in lines[1:]:
-        values = line.split()
-        if len(values) >= 2:
-            noisy_time.append(float(values[0]))
-            noisy_RNP.append(float(values[1]))
+    # Parse the two data columns below the header line
+    noisy_time, noisy_RNP = Data_Reader.read_columns(file_path, skip_header = 1)[:2]
     
     return noisy_time, noisy_RNP
 
 # ----- Import Residual of Smoothed RNP Data -----
 def read_residual_RNP (file_path):
 
-    # Step 1: Open the text file
-    with open (file_path, "r", encoding = "utf-8") as file:
-        lines = file.readlines()
-
-    # Step 2: Process the data and create an array
-    residual_time = []
-    residual_RNP = []
-    
-    # Step 3: Process each subsequent line and append the values
-    for line in lines[1:]:
-        values = line.split()
-        if len(values) >= 2:
-            residual_time.append(float(values[0]))
-            residual_RNP.append(float(values[1]))
+    # Parse the two data columns below the header line
+    residual_time, residual_RNP = Data_Reader.read_columns(file_path, skip_header = 1)[:2]
     
     return residual_time, residual_RNP
 
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Shared Test Fixtures
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# The modules live at the repository root, next to this folder
+repository_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_folder)
+
+import Data_Reader
+
+# Noisy data sets of the corpus the smoothers are checked on
+data_set_paths = [os.path.join(repository_folder, "Noisy RNP Model", scenario, level, "noisy_data_1.txt")
+                  for scenario in ("All", "Transient", "BDF") for level in ("25%", "75%")]
+
+@pytest.fixture(scope = "session")
+def noisy_log_RNP():
+
+    # Log time and a (data set x time) stack of log RNP, read without writing sidecars into the corpus
+    columns = [Data_Reader.read_columns(file_path, skip_header = 1, cache = False)[:2] for file_path in data_set_paths]
+
+    return np.log(columns[0][0]), np.log(np.vstack([RNP for _, RNP in columns]))
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+LOWESS Engine Tests
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+import pytest
+import Smoothing_Lowess
+
+# ----- Reference LOWESS -----
+def reference_lowess(y, span, x = None, robust = False, iterations = 5):
+
+    # Point-by-point definition of MATLAB smooth(y, span, "lowess"/"rlowess"): a tricube-weighted line
+    # through the span nearest neighbors, the weight reaching zero at the farthest of them
+    n = len(y)
+    x = np.arange(1, n + 1, dtype = float) if x is None else x
+    weights = []
+    for i in range(n):
+        neighbors = np.sort(np.argsort(np.abs(x - x[i]), kind = "stable")[:span])
+        distance = np.abs(x[neighbors] - x[i])
+        weights.append((neighbors, (1 - (distance / distance.max()) ** 3) ** 3))
+
+    def fit(robust_weights, previous = None):
+        fitted = np.empty(n)
+        for i, (neighbors, weight) in enumerate(weights):
+            weight = weight * robust_weights[neighbors]
+            if np.count_nonzero(weight) < 2:
+                # A line through fewer than two weighted points is undetermined, the weighted mean stands in,
+                # and a point without any weighted neighbor keeps its previous fit
+                fitted[i] = np.sum(weight * y[neighbors]) / np.sum(weight) if weight.any() else previous[i]
+                continue
+            design = np.column_stack((np.ones(len(neighbors)), x[neighbors] - x[i]))
+            fitted[i] = np.linalg.lstsq(design * np.sqrt(weight)[:, None], y[neighbors] * np.sqrt(weight), rcond = None)[0][0]
+        return fitted
+
+    fitted = fit(np.ones(n))
+    for _ in range(iterations if robust else 0):
+        # Bisquare weights on six median absolute residuals; a zero scale leaves every weight at one
+        residual = y - fitted
+        scale = 6 * np.median(np.abs(residual))
+        u = residual / scale if scale > 0 else np.zeros(n)
+        fitted = fit(np.where(np.abs(u) < 1, (1 - u * u) ** 2, 0), fitted)
+
+    return fitted
+
+# ----- Tests -----
+@pytest.mark.parametrize("span", [3, 5, 9, 19])
+def test_index_axis_matches_reference(noisy_log_RNP, span):
+
+    # The cached operator of the uniform index axis reproduces the point-by-point fits
+    _, log_RNP = noisy_log_RNP
+    smoothed = Smoothing_Lowess.lowess(log_RNP, span)
+    for series, result in zip(log_RNP[:2], smoothed[:2]):
+        np.testing.assert_allclose(result, reference_lowess(series, span), rtol = 0, atol = 1e-9)
+
+def test_even_span_is_rounded_up_on_the_index_axis(noisy_log_RNP):
+
+    # As in MATLAB smooth, an even span on uniform data is forced odd
+    _, log_RNP = noisy_log_RNP
+    np.testing.assert_array_equal(Smoothing_Lowess.lowess(log_RNP, 8), Smoothing_Lowess.lowess(log_RNP, 9))
+
+def test_operator_matches_direct_fits(noisy_log_RNP):
+
+    # The operator path and the sliding-window path agree on the same uniform axis
+    _, log_RNP = noisy_log_RNP
+    x = np.arange(1, log_RNP.shape[1] + 1, dtype = float)
+    start, dmax = Smoothing_Lowess.neighbor_windows(x, 9)
+    direct = Smoothing_Lowess.local_linear_fit(x, log_RNP, start, dmax, 9)
+    np.testing.assert_allclose(Smoothing_Lowess.lowess(log_RNP, 9), direct, rtol = 0, atol = 1e-9)
+
+@pytest.mark.parametrize("span", [5, 12])
+def test_log_time_axis_matches_reference(noisy_log_RNP, span):
+
+    # Non-uniform axes take the span nearest neighbors of every point without rounding the span
+    log_time, log_RNP = noisy_log_RNP
+    smoothed = Smoothing_Lowess.lowess(log_RNP[0], span, x = log_time)
+    np.testing.assert_allclose(smoothed, reference_lowess(log_RNP[0], span, x = log_time), rtol = 0, atol = 1e-9)
+
+def test_robust_iterations_match_reference(noisy_log_RNP):
+
+    _, log_RNP = noisy_log_RNP
+    # The outliers of the corpus empty whole windows, which keep their previous fit
+    smoothed = Smoothing_Lowess.lowess(log_RNP[:2], 7, robust = True)
+    assert np.all(np.isfinite(smoothed))
+    for series, result in zip(log_RNP[:2], smoothed):
+        np.testing.assert_allclose(result, reference_lowess(series, 7, robust = True), rtol = 0, atol = 1e-8)
+
+def test_batch_matches_single_series(noisy_log_RNP):
+
+    _, log_RNP = noisy_log_RNP
+    batch = Smoothing_Lowess.lowess(log_RNP, 7, robust = True)
+    np.testing.assert_allclose(batch[3], Smoothing_Lowess.lowess(log_RNP[3], 7, robust = True), rtol = 0, atol = 1e-12)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+P-Spline Engine Tests
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+import pytest
+import Smoothing_PSpline
+
+pygam = pytest.importorskip("pygam")
+
+def test_fixed_penalty_matches_linear_gam(noisy_log_RNP):
+
+    # The GAM of the paper: pygam's defaults of 20 cubic P-splines with lam = 0.6
+    log_time, log_RNP = noisy_log_RNP
+    for k, series in enumerate(log_RNP):
+        expected = pygam.LinearGAM(n_splines = 20, lam = 0.6).fit(log_time[:, None], series).predict(log_time[:, None])
+        np.testing.assert_allclose(Smoothing_PSpline.pspline(series, log_time, lam = 0.6, n_splines = 20), expected,
+                                   rtol = 0, atol = 1e-6, err_msg = f"data set {k}")
+
+def test_gcv_penalty_matches_gridsearch(noisy_log_RNP):
+
+    # The B-spline of the paper: 100 P-splines with the penalty of every data set picked by GCV over pygam's grid
+    log_time, log_RNP = noisy_log_RNP
+    lams, _ = Smoothing_PSpline.pspline_gcv(log_RNP, log_time, n_splines = 100)
+    smoothed = Smoothing_PSpline.pspline(log_RNP, log_time, lam = None, n_splines = 100)
+    for k, series in enumerate(log_RNP):
+        gam = pygam.LinearGAM(n_splines = 100).gridsearch(log_time[:, None], series, progress = False)
+        assert lams[k] == pytest.approx(gam.lam[0][0], rel = 1e-9), f"data set {k}"
+        np.testing.assert_allclose(smoothed[k], gam.predict(log_time[:, None]), rtol = 0, atol = 1e-6, err_msg = f"data set {k}")
+
+def test_new_grid_matches_linear_gam(noisy_log_RNP):
+
+    # Evaluating the fit on another grid of the same axis, as for plotting
+    log_time, log_RNP = noisy_log_RNP
+    x_new = np.linspace(log_time[0], log_time[-1], 200)
+    expected = pygam.LinearGAM(n_splines = 20, lam = 0.6).fit(log_time[:, None], log_RNP[0]).predict(x_new[:, None])
+    np.testing.assert_allclose(Smoothing_PSpline.pspline(log_RNP[0], log_time, lam = 0.6, x_new = x_new), expected, rtol = 0, atol = 1e-6)
+
+def test_batch_matches_single_series(noisy_log_RNP):
+
+    # A stack is smoothed row by row, with its own GCV penalty per row
+    log_time, log_RNP = noisy_log_RNP
+    batch = Smoothing_PSpline.pspline(log_RNP, log_time, lam = None, n_splines = 100)
+    for k, series in enumerate(log_RNP):
+        np.testing.assert_allclose(batch[k], Smoothing_PSpline.pspline(series, log_time, lam = None, n_splines = 100), rtol = 0, atol = 1e-12)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Savitzky-Golay Engine Tests
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+import pytest
+from scipy.signal import savgol_filter
+import Smoothing_Operators
+import Smoothing_SavGol
+
+# Windows and orders of the paper grid, plus a wide high-order window
+windows_orders = [(3, 1), (5, 2), (7, 3), (11, 4), (11, 7), (51, 6)]
+
+@pytest.mark.parametrize("window, order", windows_orders)
+def test_uniform_matches_savgol_filter(noisy_log_RNP, window, order):
+
+    # Interior convolution and end-window polynomial fits, as savgol_filter's "interp" mode
+    _, log_RNP = noisy_log_RNP
+    expected = savgol_filter(log_RNP, window, order, mode = "interp", axis = -1)
+    np.testing.assert_allclose(Smoothing_SavGol.savgol(log_RNP, window, order), expected, rtol = 0, atol = 1e-9)
+
+@pytest.mark.parametrize("window, order", windows_orders)
+def test_operator_matches_engine(noisy_log_RNP, window, order):
+
+    # The sparse operator of the experiment runner and the direct engine share their coefficients
+    log_time, log_RNP = noisy_log_RNP
+    operator = Smoothing_Operators.smoothing_operator("savgol", log_time, window = window, order = order)
+    np.testing.assert_allclose(Smoothing_Operators.apply_operator(operator, log_RNP), Smoothing_SavGol.savgol(log_RNP, window, order),
+                               rtol = 0, atol = 1e-9)
+
+def test_even_window_is_reduced(noisy_log_RNP):
+
+    # As in MATLAB smooth, an even window is reduced by one
+    _, log_RNP = noisy_log_RNP
+    np.testing.assert_array_equal(Smoothing_SavGol.savgol(log_RNP, 8, 2), Smoothing_SavGol.savgol(log_RNP, 7, 2))
+
+def test_order_must_be_below_window(noisy_log_RNP):
+
+    _, log_RNP = noisy_log_RNP
+    with pytest.raises(ValueError):
+        Smoothing_SavGol.savgol(log_RNP, 5, 5)
+
+def test_nonuniform_on_uniform_axis_matches_uniform(noisy_log_RNP):
+
+    # On an evenly spaced axis the local fits in x are the uniform convolution
+    _, log_RNP = noisy_log_RNP
+    x = np.linspace(-2, 5, log_RNP.shape[1])
+    np.testing.assert_allclose(Smoothing_SavGol.savgol(log_RNP, 9, 3, x = x), Smoothing_SavGol.savgol(log_RNP, 9, 3), rtol = 0, atol = 1e-9)
+
+@pytest.mark.parametrize("window, order", [(5, 2), (9, 3)])
+def test_log_time_matches_local_polyfit(noisy_log_RNP, window, order):
+
+    # Every point takes the value at its own log(t) of the polynomial fitted to its window, shifted inwards at the ends
+    log_time, log_RNP = noisy_log_RNP
+    n = len(log_time)
+    expected = np.empty(n)
+    for i in range(n):
+        start = min(max(i - (window - 1) // 2, 0), n - window)
+        window_time = log_time[start:start + window]
+        expected[i] = np.polyval(np.polyfit(window_time - log_time[i], log_RNP[0, start:start + window], order), 0)
+    np.testing.assert_allclose(Smoothing_SavGol.savgol(log_RNP[0], window, order, x = log_time), expected, rtol = 0, atol = 1e-8)
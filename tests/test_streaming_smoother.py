@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming Smoother Tests
+
+Author: Munthe, Felix A.
+Created on Sunday, 18 October 2026
+"""
+
+import numpy as np
+import pytest
+from scipy.ndimage import gaussian_filter1d
+import Smoothing_Operators
+import Streaming_Smoother
+
+# Methods and parameters the stream supports, the moving average with both an odd and a wider window
+settings = [("gaussian_kernel", {"sigma": 5}), ("moving_average", {"window": 5}), ("moving_average", {"window": 7}),
+            ("lowess", {"span": 5}), ("lowess", {"span": 9}), ("savgol", {"window": 7, "order": 2})]
+
+def batch_smooth(method, parameters, series):
+
+    # The batch operator on the index axis, the axis the streaming stencils are read from
+    operator = Smoothing_Operators.smoothing_operator(method, np.arange(len(series), dtype = float), **parameters)
+
+    return Smoothing_Operators.apply_operator(operator, series)
+
+@pytest.mark.parametrize("method, parameters", settings)
+def test_stream_matches_batch_operator(noisy_log_RNP, method, parameters):
+
+    # Values finalized over chunks of random sizes, then the flushed tail, reproduce the batch smoothing
+    _, log_RNP = noisy_log_RNP
+    generator = np.random.default_rng(0)
+    for series in log_RNP:
+        smoother = Streaming_Smoother.StreamingSmoother(method, **parameters)
+        bounds = np.concatenate(([0], np.sort(generator.choice(np.arange(1, len(series)), 20, replace = False)), [len(series)]))
+        streamed = np.concatenate([smoother.extend(series[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])] + [smoother.flush()])
+        np.testing.assert_allclose(streamed, batch_smooth(method, parameters, series), rtol = 0, atol = 1e-9)
+
+def test_gaussian_operator_matches_gaussian_filter(noisy_log_RNP):
+
+    # The Gaussian operator mirrors the series as gaussian_filter1d's "reflect" mode
+    _, log_RNP = noisy_log_RNP
+    for sigma in (1, 5, 20):
+        expected = gaussian_filter1d(log_RNP, sigma, mode = "reflect", truncate = 4.0, axis = -1)
+        operator = Smoothing_Operators.smoothing_operator("gaussian_kernel", np.arange(log_RNP.shape[1], dtype = float), sigma = sigma)
+        np.testing.assert_allclose(Smoothing_Operators.apply_operator(operator, log_RNP), expected, rtol = 0, atol = 1e-12)
+
+@pytest.mark.parametrize("method, parameters", settings)
+def test_short_stream_flush_matches_batch_operator(noisy_log_RNP, method, parameters):
+
+    # A stream shorter than the stencil finalizes nothing, and its flush is the batch operator of its own length
+    _, log_RNP = noisy_log_RNP
+    smoother = Streaming_Smoother.StreamingSmoother(method, **parameters)
+    series = log_RNP[0, :smoother.width - 1]
+    assert len(smoother.extend(series)) == 0
+    np.testing.assert_allclose(smoother.flush(), batch_smooth(method, parameters, series), rtol = 0, atol = 1e-9)
+
+@pytest.mark.parametrize("method, parameters", settings)
+def test_one_value_finalized_per_update(noisy_log_RNP, method, parameters):
+
+    # After the first full window every sample finalizes exactly one value, and the flush completes the series
+    _, log_RNP = noisy_log_RNP
+    series = log_RNP[0]
+    smoother = Streaming_Smoother.StreamingSmoother(method, **parameters)
+    counts = np.array([len(smoother.update(value)) for value in series])
+    width = smoother.width
+    assert np.all(counts[:width - 1] == 0)
+    assert counts[width - 1] == width - smoother.edge
+    assert np.all(counts[width:] == 1)
+    assert smoother.finalized + len(smoother.flush()) == len(series)
+    assert smoother.finalized == len(series)